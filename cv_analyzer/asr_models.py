@@ -0,0 +1,61 @@
+import logging
+import os
+import resource
+import threading
+import time
+from dataclasses import dataclass, field
+import torch
+import whisper
+
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "base")
+WHISPER_CACHE_DIR = os.path.expanduser(os.environ.get("WHISPER_CACHE_DIR", "~/.cache/whisper"))
+
+@dataclass
+class LoadedModel:
+    name: str
+    device: str
+    model: object
+    load_seconds: float
+    rss_mb: float
+    # Whisper installs decoding hooks on the model per call, so calls on one model are serialized
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def transcribe(self, audio, **kwargs):
+        with self.lock:
+            return self.model.transcribe(audio, **kwargs)
+
+_models = {}
+_registry_lock = threading.Lock()
+
+def resident_memory_mb():
+    # Current RSS from /proc where available, otherwise the peak reported by getrusage
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def default_device():
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+def get_whisper_model(name=None, device=None):
+    # Loaded once per process and shared by every session; Streamlit reruns reuse the same entry
+    name = name or WHISPER_MODEL
+    device = device or default_device()
+    key = (name, device)
+    with _registry_lock:
+        if key not in _models:
+            os.makedirs(WHISPER_CACHE_DIR, exist_ok=True)
+            rss_before = resident_memory_mb()
+            started = time.perf_counter()
+            model = whisper.load_model(name, device=device, download_root=WHISPER_CACHE_DIR, in_memory=True)
+            load_seconds = time.perf_counter() - started
+            rss_mb = resident_memory_mb()
+            _models[key] = LoadedModel(name, device, model, load_seconds, rss_mb)
+            logging.info(f"ASR model loaded: whisper {name} on {device} in {load_seconds:.2f}s, "
+                         f"RSS {rss_before:.0f} -> {rss_mb:.0f} MB")
+        return _models[key]
+
+def loaded_models():
+    with _registry_lock:
+        return list(_models.values())
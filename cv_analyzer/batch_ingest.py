@@ -0,0 +1,236 @@
+import argparse
+import csv
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from cv_analyzer import extract_text_cached, analyze_cv_fields, format_analysis
+from models import Database
+from embedding_index import safe_similarity
+from llm_client import get_llm_client
+
+TEMP_DIR = "temp"
+DEFAULT_LLM_CONCURRENCY = 2
+# The embedding index serializes writes behind one lock, so a single thread is enough
+EMBED_WORKERS = 1
+
+def load_sources(directory=None, manifest=None):
+    # Returns (pdf_path, candidate_name) pairs
+    sources = []
+    if directory:
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.lower().endswith('.pdf'):
+                path = os.path.join(directory, file_name)
+                sources.append((os.path.abspath(path), os.path.splitext(file_name)[0]))
+    if manifest:
+        base_dir = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, newline='') as f:
+            for row in csv.reader(f):
+                if not row or row[0].startswith('#') or row[0] == 'path':
+                    continue
+                path = row[0].strip()
+                if not os.path.isabs(path):
+                    path = os.path.join(base_dir, path)
+                name = row[1].strip() if len(row) > 1 and row[1].strip() else os.path.splitext(os.path.basename(path))[0]
+                sources.append((os.path.abspath(path), name))
+    return sources
+
+def _timed_extract(pdf_path):
+    start = time.perf_counter()
+    with open(pdf_path, 'rb') as f:
+        # Parallelism comes from the process pool; OCR threads per process would multiply it
+        text = extract_text_cached(f.read(), pdf_path, write=False, ocr_workers=1)
+    return text, time.perf_counter() - start
+
+def _timed_embed(job_id, job_description, cv_text, name):
+    start = time.perf_counter()
+    similarity = safe_similarity(job_id, job_description, cv_text, name)
+    return similarity, time.perf_counter() - start
+
+def _timed_analyze(job_description, cv_text, rescore=False):
+    start = time.perf_counter()
+    result = analyze_cv_fields(job_description, cv_text, bypass_cache=rescore)
+    return result, time.perf_counter() - start
+
+class BatchStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stage_seconds = {'extract': 0.0, 'embed': 0.0, 'analyze': 0.0, 'store': 0.0}
+        self.completed = 0
+        self.screened_out = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def cvs_per_minute(self):
+        elapsed = time.perf_counter() - self.started
+        return self.completed / elapsed * 60 if elapsed > 0 else 0.0
+
+    def report(self):
+        elapsed = time.perf_counter() - self.started
+        lines = [
+            f"Processed {self.completed} CVs ({self.failed} failed, {self.screened_out} not shortlisted, "
+            f"{self.skipped} already ingested) in {elapsed:.1f}s",
+            f"Throughput: {self.cvs_per_minute():.2f} CVs/min",
+        ]
+        for stage, seconds in self.stage_seconds.items():
+            mean = seconds / self.completed if self.completed else 0.0
+            lines.append(f"  {stage:<8} total {seconds:8.1f}s  mean {mean:6.2f}s/CV")
+        return '\n'.join(lines)
+
+def _write_cv_text(path, name, cv_text, temp_dir):
+    # Keyed on the source path too: names repeat ("Not found" especially) and must not share a file
+    source_hash = hashlib.sha256(path.encode('utf-8')).hexdigest()[:12]
+    cv_path = os.path.join(temp_dir, f"{name}_{source_hash}_text.txt")
+    with open(cv_path, 'w') as f:
+        f.write(cv_text)
+    return cv_path
+
+def _store_result(db, job_id, path, name, cv_text, fields, temp_dir, similarity=None):
+    return db.add_candidate(
+        job_id=job_id,
+        name=name,
+        cv_path=_write_cv_text(path, name, cv_text, temp_dir),
+        score=fields['score'],
+        analysis=format_analysis(fields),
+        email=fields['email'],
+        phone=fields['phone'],
+        location=fields['location'],
+        similarity=similarity,
+        source_path=path
+    )
+
+def _store_screened_out(db, job_id, path, name, cv_text, temp_dir, similarity):
+    # Below the shortlist cut: keep the candidate and similarity, skip the LLM
+    return db.add_candidate(
+        job_id=job_id,
+        name=name,
+        cv_path=_write_cv_text(path, name, cv_text, temp_dir),
+        score=None,
+        analysis=f"Not shortlisted (similarity {similarity:.2f})" if similarity is not None else "Not shortlisted",
+        similarity=similarity,
+        source_path=path
+    )
+
+def run_batch(job_id, sources, db=None, llm_concurrency=DEFAULT_LLM_CONCURRENCY,
+              extract_workers=None, temp_dir=TEMP_DIR, rescore=False, shortlist=None, progress_every=10):
+    db = db or Database()
+    os.makedirs(temp_dir, exist_ok=True)
+    job_description = db.get_job_description(job_id)
+    stats = BatchStats()
+    get_llm_client().set_max_concurrency(llm_concurrency)
+
+    # Resume: anything already stored for this job is skipped
+    done = db.get_ingested_sources(job_id)
+    pending_sources = [(path, name) for path, name in sources if path not in done]
+    stats.skipped = len(sources) - len(pending_sources)
+    logging.info(f"Batch ingest for job {job_id}: {len(pending_sources)} to process, {stats.skipped} already done")
+
+    with ProcessPoolExecutor(max_workers=extract_workers) as extract_pool, \
+            ThreadPoolExecutor(max_workers=EMBED_WORKERS) as embed_pool, \
+            ThreadPoolExecutor(max_workers=llm_concurrency) as llm_pool:
+
+        def submit_analysis(path, name, cv_text, similarity):
+            # The pool size bounds how many requests Ollama sees at once
+            future = llm_pool.submit(_timed_analyze, job_description, cv_text, rescore)
+            in_flight[future] = ('analyze', path, name, cv_text, similarity)
+
+        in_flight = {}
+        for path, name in pending_sources:
+            in_flight[extract_pool.submit(_timed_extract, path)] = ('extract', path, name, None, None)
+        # CVs not yet through extraction and embedding; with --shortlist every CV has to be
+        # embedded before any is sent to the LLM
+        screening_left = len(pending_sources)
+        screened = []
+
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, path, name, cv_text, similarity = in_flight.pop(future)
+                try:
+                    if stage == 'extract':
+                        cv_text, seconds = future.result()
+                        stats.stage_seconds['extract'] += seconds
+                        # Embedding runs off this loop so it doesn't hold up dispatch of other stages
+                        embed_future = embed_pool.submit(_timed_embed, job_id, job_description, cv_text, name)
+                        in_flight[embed_future] = ('embed', path, name, cv_text, None)
+                        continue
+
+                    if stage == 'embed':
+                        similarity, seconds = future.result()
+                        screening_left -= 1
+                        stats.stage_seconds['embed'] += seconds
+                        if shortlist:
+                            screened.append((path, name, cv_text, similarity))
+                        else:
+                            submit_analysis(path, name, cv_text, similarity)
+                        continue
+
+                    result, seconds = future.result()
+                    stats.stage_seconds['analyze'] += seconds
+                    store_start = time.perf_counter()
+                    _store_result(db, job_id, path, name, cv_text, result, temp_dir, similarity)
+                    stats.stage_seconds['store'] += time.perf_counter() - store_start
+                    stats.completed += 1
+                    if stats.completed % progress_every == 0:
+                        logging.info(f"Batch ingest progress: {stats.completed}/{len(pending_sources)} "
+                                     f"({stats.cvs_per_minute():.2f} CVs/min)")
+                except Exception as e:
+                    if stage in ('extract', 'embed'):
+                        screening_left -= 1
+                    stats.failed += 1
+                    logging.error(f"Batch ingest failed at {stage} for {path}: {str(e)}")
+                    db.mark_ingest_status(job_id, path, 'failed', error=str(e))
+
+            if shortlist and screening_left == 0 and screened:
+                screened.sort(key=lambda item: item[3] if item[3] is not None else -1.0, reverse=True)
+                for path, name, cv_text, similarity in screened[:shortlist]:
+                    submit_analysis(path, name, cv_text, similarity)
+                for path, name, cv_text, similarity in screened[shortlist:]:
+                    try:
+                        _store_screened_out(db, job_id, path, name, cv_text, temp_dir, similarity)
+                        stats.screened_out += 1
+                    except Exception as e:
+                        stats.failed += 1
+                        logging.error(f"Batch ingest failed at store for {path}: {str(e)}")
+                        db.mark_ingest_status(job_id, path, 'failed', error=str(e))
+                logging.info(f"Shortlisted {min(shortlist, len(screened))} of {len(screened)} CVs by similarity")
+                screened = []
+
+    logging.info(stats.report())
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk CV ingestion for a job")
+    parser.add_argument('--job-id', required=True, help="ID of the job the CVs are analyzed against")
+    parser.add_argument('--dir', help="Directory containing PDF CVs")
+    parser.add_argument('--manifest', help="CSV manifest of 'path,name' rows")
+    parser.add_argument('--llm-concurrency', type=int, default=DEFAULT_LLM_CONCURRENCY,
+                        help="Maximum concurrent Ollama requests")
+    parser.add_argument('--extract-workers', type=int, default=None,
+                        help="Processes used for PDF text extraction (default: CPU count)")
+    parser.add_argument('--temp-dir', default=TEMP_DIR)
+    parser.add_argument('--shortlist', type=int, default=None,
+                        help="Only send the top K CVs by embedding similarity to the LLM")
+    parser.add_argument('--rescore', action='store_true',
+                        help="Bypass the LLM response cache and score every CV again")
+    args = parser.parse_args()
+
+    if not args.dir and not args.manifest:
+        parser.error("one of --dir or --manifest is required")
+
+    sources = load_sources(args.dir, args.manifest)
+    print(f"Found {len(sources)} CVs")
+    stats = run_batch(
+        args.job_id,
+        sources,
+        llm_concurrency=args.llm_concurrency,
+        extract_workers=args.extract_workers,
+        temp_dir=args.temp_dir,
+        rescore=args.rescore,
+        shortlist=args.shortlist,
+    )
+    print(stats.report())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import re
+import time
+from contact_extractor import CONTACT_FIELDS, CONFIDENCE_THRESHOLD, extract_contact_fields
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'contact_corpus.json')
+
+# Usage (from cv_analyzer/): python -m benchmarks.contact_extractor_bench [--offline]
+
+def normalize(field, value):
+    value = (value or '').strip()
+    if not value or value.lower() == 'not found':
+        return ''
+    if field == 'phone':
+        return re.sub(r'\D', '', value)
+    return re.sub(r'[^a-z0-9@.]+', ' ', value.lower()).strip()
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+def time_local(corpus, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for entry in corpus:
+            extract_contact_fields(entry['cv_text'])
+    return (time.perf_counter() - start) / (repeats * len(corpus))
+
+def llm_reference(corpus):
+    # Runs the pre-extractor path: every field comes from the LLM
+    from cv_analyzer import extract_candidate_details, parse_analysis
+    latencies = []
+    for entry in corpus:
+        start = time.perf_counter()
+        response = extract_candidate_details(entry['cv_text'], bypass_cache=True, use_local=False)
+        latencies.append(time.perf_counter() - start)
+        _, details = parse_analysis(response)
+        entry['reference'] = {field: details.get(field.capitalize(), 'Not found') for field in CONTACT_FIELDS}
+    return sum(latencies) / len(latencies)
+
+def agreement(corpus):
+    per_field = {field: {'agree': 0, 'resolved': 0} for field in CONTACT_FIELDS}
+    for entry in corpus:
+        fields = extract_contact_fields(entry['cv_text'])
+        for field in CONTACT_FIELDS:
+            match = fields.get(field)
+            resolved = match is not None and match.confidence >= CONFIDENCE_THRESHOLD
+            local_value = match.value if resolved else ''
+            if resolved:
+                per_field[field]['resolved'] += 1
+            if normalize(field, local_value) == normalize(field, entry['reference'][field]):
+                per_field[field]['agree'] += 1
+    return per_field
+
+def main():
+    parser = argparse.ArgumentParser(description="Local contact extractor vs LLM extraction")
+    parser.add_argument('--corpus', default=CORPUS_PATH)
+    parser.add_argument('--repeats', type=int, default=1000)
+    parser.add_argument('--offline', action='store_true',
+                        help="Skip Ollama and compare against the hand-written fixture references instead")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    local_seconds = time_local(corpus, args.repeats)
+    print(f"Corpus: {len(corpus)} CVs")
+    print(f"Local extractor: {local_seconds * 1e6:.1f} us/CV")
+    if args.offline:
+        print("LLM extraction:  skipped (--offline)")
+        metric = 'fixture match'
+    else:
+        # The reference is what the LLM-only path extracts today
+        llm_seconds = llm_reference(corpus)
+        print(f"LLM extraction:  {llm_seconds * 1e3:.1f} ms/CV ({llm_seconds / local_seconds:,.0f}x slower)")
+        metric = 'LLM agreement'
+
+    print(f"\n{'field':<10}{'resolved':>10}{metric:>16}")
+    for field, counts in agreement(corpus).items():
+        print(f"{field:<10}{counts['resolved']:>7}/{len(corpus):<2}{counts['agree'] / len(corpus):>15.0%}")
+
+if __name__ == "__main__":
+    main()
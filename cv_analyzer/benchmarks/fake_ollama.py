@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from aiohttp import web
+
+DEFAULT_TEXT = ("Can you walk me through a production incident you debugged end to end, "
+                "including how you isolated the root cause and what you changed afterwards?")
+
+@dataclass
+class FakeOllamaConfig:
+    ttft: float = 0.2
+    token_delay: float = 0.02
+    error_rate: float = 0.0
+    text: str = DEFAULT_TEXT
+    seed: int = 0
+
+def sample_for_schema(schema):
+    # Smallest value that satisfies the parts of JSON schema our prompts use
+    if 'enum' in schema:
+        return schema['enum'][0]
+    kind = schema.get('type')
+    if kind == 'object':
+        return {key: sample_for_schema(value) for key, value in schema.get('properties', {}).items()}
+    if kind == 'array':
+        return [sample_for_schema(schema.get('items', {'type': 'string'}))]
+    if kind in ('number', 'integer'):
+        return 7 if schema.get('maximum', 10) >= 7 else schema.get('minimum', 0)
+    if kind == 'boolean':
+        return True
+    if schema.get('description', '').lower().startswith('overall score'):
+        return "7/10"
+    return "Not found" if kind is None else "sample"
+
+# Stand-in for the Ollama HTTP API with controllable latency and failure rate
+class FakeOllama:
+    def __init__(self, config=None, host='127.0.0.1', port=0):
+        self.config = config or FakeOllamaConfig()
+        self.host = host
+        self.port = port
+        self.random = random.Random(self.config.seed)
+        self.requests = 0
+        self.errors = 0
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def _tokens(self, payload):
+        if payload.get('format'):
+            schema = payload['format']
+            body = sample_for_schema(schema) if isinstance(schema, dict) else {"result": "sample"}
+            text = json.dumps(body)
+            # Stream JSON in small pieces like a real model would
+            return [text[i:i + 4] for i in range(0, len(text), 4)]
+        words = self.config.text.split(' ')
+        return [word + ' ' for word in words[:-1]] + words[-1:]
+
+    async def _handle(self, request, chat):
+        self.requests += 1
+        payload = await request.json()
+        if self.random.random() < self.config.error_rate:
+            self.errors += 1
+            return web.json_response({"error": "injected failure"}, status=503)
+
+        model = payload.get('model', 'fake')
+        tokens = self._tokens(payload)
+        started = time.perf_counter()
+        await asyncio.sleep(self.config.ttft)
+
+        def chunk(text, done=False):
+            data = {"model": model, "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ'), "done": done}
+            if chat:
+                data["message"] = {"role": "assistant", "content": text}
+            else:
+                data["response"] = text
+            if done:
+                data["eval_count"] = len(tokens)
+                data["eval_duration"] = int(max(time.perf_counter() - started - self.config.ttft, 1e-6) * 1e9)
+            return data
+
+        if not payload.get('stream', True):
+            await asyncio.sleep(self.config.token_delay * len(tokens))
+            return web.json_response(chunk(''.join(tokens), done=True))
+
+        response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+        await response.prepare(request)
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(self.config.token_delay)
+            await response.write((json.dumps(chunk(token)) + '\n').encode())
+        await response.write((json.dumps(chunk('', done=True)) + '\n').encode())
+        await response.write_eof()
+        return response
+
+    async def _generate(self, request):
+        return await self._handle(request, chat=False)
+
+    async def _chat(self, request):
+        return await self._handle(request, chat=True)
+
+    def _app(self):
+        app = web.Application()
+        app.router.add_post('/api/generate', self._generate)
+        app.router.add_post('/api/chat', self._chat)
+        return app
+
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._runner = web.AppRunner(self._app())
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, self.host, self.port)
+            self._loop.run_until_complete(site.start())
+            self.port = self._runner.addresses[0][1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="fake-ollama", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self.url
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server for benchmarks")
+    parser.add_argument('--port', type=int, default=11434)
+    parser.add_argument('--ttft', type=float, default=0.2)
+    parser.add_argument('--token-delay', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    config = FakeOllamaConfig(ttft=args.ttft, token_delay=args.token_delay, error_rate=args.error_rate)
+    web.run_app(FakeOllama(config, port=args.port)._app(), host='127.0.0.1', port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import time
+from types import SimpleNamespace
+
+# Single-threaded BLAS so the numbers are per core
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+os.environ.setdefault('OPENBLAS_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
+
+import numpy as np
+from interview_analyzer import NUM_LANDMARKS, compute_metrics, compute_metrics_batch, landmarks_to_array
+
+# Usage (from cv_analyzer/): python -m benchmarks.landmark_metrics_bench [--frames 5000]
+
+def synthetic_frames(count, seed=0):
+    # A seated upper body drifting slightly from frame to frame
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.3, 0.7, size=(NUM_LANDMARKS, 4)).astype(np.float32)
+    base[:, 3] = 0.9
+    drift = np.cumsum(rng.normal(0, 0.002, size=(count, NUM_LANDMARKS, 4)), axis=0).astype(np.float32)
+    drift[..., 3] = 0
+    return base + drift
+
+def as_pose_landmarks(frame):
+    # Same shape as MediaPipe's result: .landmark items with x, y, z, visibility
+    return SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z, visibility=v) for x, y, z, v in frame])
+
+def fps(fn, frames):
+    started = time.perf_counter()
+    fn()
+    return frames / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description="Landmark-to-metrics throughput on one core")
+    parser.add_argument('--frames', type=int, default=5000)
+    args = parser.parse_args()
+
+    frames = synthetic_frames(args.frames)
+    landmarks = [as_pose_landmarks(frame) for frame in frames]
+
+    def convert():
+        for pose in landmarks:
+            landmarks_to_array(pose)
+
+    def per_frame():
+        previous = None
+        for pose in landmarks:
+            current = landmarks_to_array(pose)
+            compute_metrics(current, previous)
+            previous = current
+
+    def batched():
+        compute_metrics_batch(frames)
+
+    print(f"{'path':<28}{'frames/s':>14}")
+    print(f"{'landmarks_to_array':<28}{fps(convert, args.frames):>14,.0f}")
+    print(f"{'per frame (convert+metrics)':<28}{fps(per_frame, args.frames):>14,.0f}")
+    print(f"{'batched metrics':<28}{fps(batched, args.frames):>14,.0f}")
+
+if __name__ == "__main__":
+    main()
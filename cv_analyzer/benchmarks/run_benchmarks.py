@@ -0,0 +1,161 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from benchmarks.fake_ollama import FakeOllama, FakeOllamaConfig
+
+# Usage (from cv_analyzer/):
+#   python -m benchmarks.run_benchmarks --update-baseline   # record benchmarks/baseline.json
+#   python -m benchmarks.run_benchmarks                     # compare, exit 1 on regression
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+DEFAULT_THRESHOLD = 0.2
+
+JOB_DESCRIPTION = """Senior Python Engineer
+We are hiring a backend engineer to build event-driven services with Python, Kafka and PostgreSQL.
+You will own service design, code review and on-call for payment settlement systems."""
+
+CV_TEXT = """Profile
+Backend engineer with 7 years of Python experience building payment platforms.
+
+Experience
+Acme Payments 2018-2024
+Designed Kafka consumers processing 2M settlement events per day.
+Migrated reporting from MySQL to PostgreSQL with zero downtime.
+
+Skills
+Python, Go, Kafka, PostgreSQL, Docker, Kubernetes, AWS
+"""
+
+ANSWER = ("I would start by checking consumer lag in Kafka, then look at the settlement service logs "
+          "for the failing partition, reproduce with the offending message and add an idempotency key.")
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(samples, wall_seconds):
+    return {
+        'iterations': len(samples),
+        'p50': percentile(samples, 50),
+        'p95': percentile(samples, 95),
+        'mean': statistics.fmean(samples),
+        'throughput': len(samples) / wall_seconds if wall_seconds > 0 else 0.0,
+    }
+
+def bench_sync(fn, iterations):
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, time.perf_counter() - started)
+
+async def bench_async(fn, iterations):
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, time.perf_counter() - started)
+
+def run_suite(iterations):
+    # Imported after the client is pointed at the fake server
+    from cv_analyzer import analyze_cv, analyze_cv_fields
+    from components.interview import InterviewManager
+
+    results = {}
+    results['analyze_cv'] = bench_sync(
+        lambda: analyze_cv(JOB_DESCRIPTION, CV_TEXT, bypass_cache=True), iterations)
+    results['analyze_cv_structured'] = bench_sync(
+        lambda: analyze_cv_fields(JOB_DESCRIPTION, CV_TEXT, bypass_cache=True), iterations)
+
+    async def interview_suite():
+        manager = InterviewManager(CV_TEXT, JOB_DESCRIPTION)
+        interview_results = {}
+        interview_results['generate_question'] = await bench_async(manager.generate_question, iterations)
+        interview_results['process_response'] = await bench_async(
+            lambda: manager.process_response(ANSWER), iterations)
+        interview_results['generate_score'] = await bench_async(
+            lambda: manager.generate_score(render=False), iterations)
+        return interview_results
+
+    results.update(asyncio.run(interview_suite()))
+    return results
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        for metric in ('p50', 'p95'):
+            if current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(f"{name} {metric}: {previous[metric]:.3f}s -> {current[metric]:.3f}s")
+        if current['throughput'] < previous['throughput'] * (1 - threshold):
+            regressions.append(f"{name} throughput: {previous['throughput']:.2f}/s -> {current['throughput']:.2f}/s")
+    return regressions
+
+def print_results(results):
+    print(f"{'scenario':<24}{'p50 (s)':>10}{'p95 (s)':>10}{'ops/s':>10}")
+    for name, result in results.items():
+        print(f"{name:<24}{result['p50']:>10.3f}{result['p95']:>10.3f}{result['throughput']:>10.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end LLM path benchmarks against a fake Ollama")
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--ttft', type=float, default=0.2)
+    parser.add_argument('--token-delay', type=float, default=0.02)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed fractional slowdown before a run counts as a regression")
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    config = FakeOllamaConfig(ttft=args.ttft, token_delay=args.token_delay, error_rate=args.error_rate)
+    server = FakeOllama(config)
+    url = server.start()
+
+    import llm_cache
+    from llm_client import get_llm_client
+    get_llm_client().base_url = url
+    # Keep fake responses out of the real on-disk response cache
+    llm_cache._llm_cache = llm_cache.LLMCache(path=':memory:')
+    try:
+        results = run_suite(args.iterations)
+    finally:
+        server.stop()
+
+    print_results(results)
+    run = {'config': vars(config), 'results': results}
+
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('config') != run['config']:
+        print("\nWarning: fake server settings differ from the baseline run")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("\nRegressions past threshold:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("\nNo regressions past threshold")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,55 +1,314 @@
 import cv2
 import mediapipe as mp
+import numpy as np
+import logging
 import time
-from threading import Thread
+from contextlib import contextmanager
+from threading import Condition, Lock, Thread
 
+# Full face detection runs this often; boxes are tracked cheaply in between
+DETECT_INTERVAL = 0.5
+# Faster rate used for a while after the face count changes, so the cheating rule sees it quickly
+FAST_DETECT_INTERVAL = 0.1
+FAST_DETECT_WINDOW = 2.0
+CHEATING_SECONDS = 3
+# Tracking by template matching on a downscaled grey frame
+TRACK_SCALE = 0.5
+TRACK_SEARCH_MARGIN = 0.5
+TRACK_MIN_SCORE = 0.6
+READ_BACKOFF_BASE = 0.05
+READ_BACKOFF_MAX = 2.0
+# Consecutive failed reads before the capture device is reopened
+READ_FAILURES_BEFORE_REOPEN = 20
+CAPTURE_SLOTS = 3
+# Extra slots so UI readers holding a frame never block the annotator
+OUTPUT_SLOTS = 4
+
+# Fixed set of frame buffers shared by one writer and any number of readers. The writer fills a
+# slot that is neither the latest frame nor held by a reader, so published frames are never
+# modified while in use; a newer frame replaces an unread one, which counts as dropped.
+class FrameRing:
+    def __init__(self, slots):
+        self._buffers = [None] * slots
+        self._pins = [0] * slots
+        self._latest = None
+        self._latest_read = True
+        self._timestamp = None
+        self._condition = Condition()
+        self.sequence = 0
+        self.published = 0
+        self.dropped = 0
+
+    def writable(self):
+        # Returns (slot, buffer); buffer is None until the slot has held a frame
+        with self._condition:
+            for slot, pins in enumerate(self._pins):
+                if slot != self._latest and pins == 0:
+                    return slot, self._buffers[slot]
+        return None, None
+
+    def publish(self, slot, frame, timestamp):
+        with self._condition:
+            self._buffers[slot] = frame
+            if not self._latest_read:
+                self.dropped += 1
+            self._latest = slot
+            self._latest_read = False
+            self._timestamp = timestamp
+            self.sequence += 1
+            self.published += 1
+            self._condition.notify_all()
+
+    def acquire(self, after=0, timeout=None):
+        # Pins the newest frame published after sequence `after`: (slot, frame, sequence, timestamp)
+        with self._condition:
+            if not self._condition.wait_for(lambda: self.sequence > after, timeout):
+                return None
+            slot = self._latest
+            self._pins[slot] += 1
+            self._latest_read = True
+            return slot, self._buffers[slot], self.sequence, self._timestamp
+
+    def release(self, slot):
+        with self._condition:
+            self._pins[slot] -= 1
+
+class StageTimer:
+    def __init__(self):
+        self.totals = {}
+        self.counts = {}
+        self._lock = Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+            self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    def means(self):
+        with self._lock:
+            return {stage: self.totals[stage] / self.counts[stage] for stage in self.totals}
+
+class FaceTracker:
+    def __init__(self):
+        self.boxes = []
+        self._templates = []
+
+    def reset(self, grey, boxes):
+        self.boxes = boxes
+        self._templates = [grey[y:y + h, x:x + w].copy() for x, y, w, h in self._scaled(boxes)]
+
+    def _scaled(self, boxes):
+        return [tuple(int(v * TRACK_SCALE) for v in box) for box in boxes]
+
+    def update(self, grey):
+        # Moves each box to its best match near the last position; False means a face was lost
+        tracked = []
+        for (x, y, w, h), template in zip(self._scaled(self.boxes), self._templates):
+            if template.size == 0:
+                return False
+            margin_x, margin_y = int(w * TRACK_SEARCH_MARGIN), int(h * TRACK_SEARCH_MARGIN)
+            x0, y0 = max(x - margin_x, 0), max(y - margin_y, 0)
+            region = grey[y0:y + h + margin_y, x0:x + w + margin_x]
+            if region.shape[0] < h or region.shape[1] < w:
+                return False
+            scores = cv2.matchTemplate(region, template, cv2.TM_CCOEFF_NORMED)
+            _, best, _, (dx, dy) = cv2.minMaxLoc(scores)
+            if best < TRACK_MIN_SCORE:
+                return False
+            tracked.append(tuple(int(v / TRACK_SCALE) for v in (x0 + dx, y0 + dy, w, h)))
+        self.boxes = tracked
+        return True
+
+# Decides per frame whether to run the detector or just track, and keeps the face count
+class DetectionScheduler:
+    def __init__(self, face_detection, interval=DETECT_INTERVAL, fast_interval=FAST_DETECT_INTERVAL,
+                 fast_window=FAST_DETECT_WINDOW):
+        self.face_detection = face_detection
+        self.interval = interval
+        self.fast_interval = fast_interval
+        self.fast_window = fast_window
+        self.tracker = FaceTracker()
+        self.face_count = 0
+        self.frames = 0
+        self.detections = 0
+        # -inf so the first frame always runs the detector, whatever clock `now` comes from
+        self._last_detection = float('-inf')
+        self._fast_until = 0.0
+        # Conversion targets reused across frames; reallocated only if the frame size changes
+        self._small = None
+        self._grey = None
+        self._rgb = None
+
+    @property
+    def detection_ratio(self):
+        return self.detections / self.frames if self.frames else 0.0
+
+    def _due(self, now):
+        interval = self.fast_interval if now < self._fast_until else self.interval
+        return now - self._last_detection >= interval
+
+    def _boxes(self, results, width, height):
+        boxes = []
+        for detection in results.detections or []:
+            box = detection.location_data.relative_bounding_box
+            x, y = max(int(box.xmin * width), 0), max(int(box.ymin * height), 0)
+            boxes.append((x, y, int(box.width * width), int(box.height * height)))
+        return boxes
+
+    def process(self, image, now=None):
+        # Returns (boxes, face_count) for a BGR frame; `now` lets recorded video use its own clock
+        now = time.monotonic() if now is None else now
+        self.frames += 1
+        height, width = image.shape[:2]
+        small_size = (int(width * TRACK_SCALE), int(height * TRACK_SCALE))
+        if self._rgb is None or self._rgb.shape != image.shape:
+            self._small = np.empty((small_size[1], small_size[0], 3), dtype=image.dtype)
+            self._grey = np.empty((small_size[1], small_size[0]), dtype=image.dtype)
+            self._rgb = np.empty_like(image)
+        cv2.resize(image, small_size, dst=self._small)
+        grey = cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=self._grey)
+        if not self._due(now) and self.tracker.update(grey):
+            return self.tracker.boxes, self.face_count
+
+        results = self.face_detection.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._rgb))
+        self.detections += 1
+        self._last_detection = now
+        boxes = self._boxes(results, image.shape[1], image.shape[0])
+        if len(boxes) != self.face_count:
+            self._fast_until = now + self.fast_window
+        self.face_count = len(boxes)
+        self.tracker.reset(grey, boxes)
+        return boxes, self.face_count
+
+# Capture and inference run on separate threads joined by a latest-frame-wins ring, so a slow
+# detector drops stale frames instead of falling behind the camera
 class CameraMonitor:
-    def __init__(self, cheating_callback):
+    def __init__(self, cheating_callback, camera_index=0):
         self.mp_face_detection = mp.solutions.face_detection
         self.face_detection = self.mp_face_detection.FaceDetection(
             model_selection=0, min_detection_confidence=0.5)
-        self.cap = cv2.VideoCapture(0)
+        self.camera_index = camera_index
+        self.cap = cv2.VideoCapture(camera_index)
+        self.scheduler = DetectionScheduler(self.face_detection)
+        self.captured = FrameRing(CAPTURE_SLOTS)
+        self.annotated = FrameRing(OUTPUT_SLOTS)
+        self.timings = StageTimer()
         self.is_running = False
         self.cheating_start_time = None
         self.cheating_callback = cheating_callback
-        self.current_frame = None
-        
+        self.read_failures = 0
+        self.lag_total = 0.0
+        self.processed = 0
+        self._threads = []
+
     def start(self):
         self.is_running = True
-        Thread(target=self._monitor_feed, daemon=True).start()
-        
+        self._threads = [Thread(target=self._capture_feed, name="camera-capture", daemon=True),
+                         Thread(target=self._monitor_feed, name="camera-inference", daemon=True)]
+        for thread in self._threads:
+            thread.start()
+
     def stop(self):
         self.is_running = False
+        for thread in self._threads:
+            thread.join(timeout=2)
         self.cap.release()
-        
-    def get_frame(self):
-        return self.current_frame
-        
-    def _monitor_feed(self):
+
+    @contextmanager
+    def frame(self):
+        # Latest annotated frame, guaranteed unchanged until the block exits; None before the first
+        acquired = self.annotated.acquire(timeout=0) if self.annotated.sequence else None
+        if acquired is None:
+            yield None
+            return
+        try:
+            yield acquired[1]
+        finally:
+            self.annotated.release(acquired[0])
+
+    def stats(self):
+        return {
+            'captured': self.captured.published,
+            'dropped': self.captured.dropped,
+            'processed': self.processed,
+            'mean_lag': self.lag_total / self.processed if self.processed else None,
+            'stage_seconds': self.timings.means(),
+            'detection_ratio': self.scheduler.detection_ratio,
+        }
+
+    def _draw_detection(self, image, box):
+        x, y, w, h = box
+        cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
+
+    def _handle_read_failure(self):
+        # Back off instead of spinning on a camera that is busy, unplugged or not ready yet
+        self.read_failures += 1
+        if self.read_failures % READ_FAILURES_BEFORE_REOPEN == 0:
+            logging.warning(f"Camera read failed {self.read_failures} times in a row, reopening")
+            self.cap.release()
+            self.cap = cv2.VideoCapture(self.camera_index)
+        time.sleep(min(READ_BACKOFF_MAX, READ_BACKOFF_BASE * 2 ** min(self.read_failures - 1, 10)))
+
+    def _capture_feed(self):
         while self.is_running:
-            success, image = self.cap.read()
+            slot, buffer = self.captured.writable()
+            if slot is None:
+                time.sleep(READ_BACKOFF_BASE)
+                continue
+            started = time.perf_counter()
+            # Reads straight into the slot's buffer once it exists
+            success, image = self.cap.read(buffer) if buffer is not None else self.cap.read()
             if not success:
+                self._handle_read_failure()
                 continue
-                
-            # Convert to RGB for processing
-            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            results = self.face_detection.process(rgb_image)
-            
-            # Draw face detection boxes
-            if results.detections:
-                for detection in results.detections:
-                    self._draw_detection(image, detection)
-                
-            face_count = len(results.detections) if results.detections else 0
-            
+            self.read_failures = 0
+            self.timings.add('capture', time.perf_counter() - started)
+            self.captured.publish(slot, image, time.perf_counter())
+
+    def _annotate(self, image, boxes):
+        slot, output = self.annotated.writable()
+        if slot is None:
+            return
+        if output is None or output.shape != image.shape:
+            output = np.empty_like(image)
+        np.copyto(output, image)
+        for box in boxes:
+            self._draw_detection(output, box)
+        self.annotated.publish(slot, output, time.perf_counter())
+
+    def _monitor_feed(self):
+        sequence = 0
+        while self.is_running:
+            acquired = self.captured.acquire(after=sequence, timeout=0.5)
+            if acquired is None:
+                continue
+            slot, image, sequence, captured_at = acquired
+            try:
+                self.lag_total += time.perf_counter() - captured_at
+                self.processed += 1
+
+                started = time.perf_counter()
+                boxes, face_count = self.scheduler.process(image)
+                detected = time.perf_counter()
+                self.timings.add('detect', detected - started)
+
+                # Draw face detection boxes
+                self._annotate(image, boxes)
+                self.timings.add('annotate', time.perf_counter() - detected)
+            finally:
+                self.captured.release(slot)
+
             # Cheating detection logic
             if face_count > 1:
                 if self.cheating_start_time is None:
                     self.cheating_start_time = time.time()
-                elif time.time() - self.cheating_start_time > 3:
+                elif time.time() - self.cheating_start_time > CHEATING_SECONDS:
                     self.cheating_callback()
+                    self.is_running = False
                     break
             else:
                 self.cheating_start_time = None
-                
-            self.current_frame = image
\ No newline at end of file
+        stats = self.stats()
+        logging.info(f"Camera monitor stopped: {stats['captured']} frames captured, {stats['dropped']} dropped, "
+                     f"{self.scheduler.detections} detector runs ({stats['detection_ratio']:.0%}), "
+                     f"mean lag {stats['mean_lag'] or 0:.3f}s, stage seconds {stats['stage_seconds']}")
@@ -1,19 +1,15 @@
 import streamlit as st
 import os
-from cv_analyzer import extract_text_from_pdf, analyze_cv
+from cv_analyzer import extract_text_cached, analyze_cv_fields, format_analysis
+from embedding_index import safe_similarity
 
-def process_cv(cv_text, candidate_name, job_id, db, temp_dir):
+def process_cv(cv_text, candidate_name, job_id, db, temp_dir, rescore=False):
     job_desc = db.get_job_description(job_id)
-    result = analyze_cv(job_desc, cv_text)
-    
-    lines = result.split('\n')
-    details = {}
-    for line in lines:
-        if ':' in line:
-            key, value = line.split(':', 1)
-            details[key.strip()] = value.strip()
-    
-    score = float(details.get('Score', '0').split('/')[0])
+    similarity = safe_similarity(job_id, job_desc, cv_text, candidate_name)
+    if similarity is not None:
+        st.metric("Job similarity", f"{similarity:.2f}")
+    fields = analyze_cv_fields(job_desc, cv_text, bypass_cache=rescore)
+    result = format_analysis(fields)
     cv_path = os.path.join(temp_dir, f"{candidate_name}_text.txt")
     
     if isinstance(cv_text, str):
@@ -24,11 +20,12 @@ def process_cv(cv_text, candidate_name, job_id, db, temp_dir):
         job_id=job_id,
         name=candidate_name,
         cv_path=cv_path,
-        score=score,
+        score=fields['score'],
         analysis=result,
-        email=details.get('Email', 'Not found'),
-        phone=details.get('Phone', 'Not found'),
-        location=details.get('Location', 'Not found')
+        email=fields['email'],
+        phone=fields['phone'],
+        location=fields['location'],
+        similarity=similarity
     )
     
     st.success("Analysis Complete!")
@@ -43,18 +40,18 @@ def render_cv_page(db, temp_dir):
     
     input_method = st.radio("Choose input method:", ["Upload PDF", "Paste Text"])
     candidate_name = st.text_input("Candidate Name")
+    rescore = st.checkbox("Re-score (ignore cached analysis)", value=False)
     
     if input_method == "Upload PDF":
         uploaded_file = st.file_uploader("Upload CV (PDF)", type="pdf")
         if uploaded_file and candidate_name and st.button("Analyze PDF CV"):
             with st.spinner("Analyzing..."):
                 temp_path = os.path.join(temp_dir, f"{candidate_name}_{uploaded_file.name}")
-                with open(temp_path, "wb") as f:
-                    f.write(uploaded_file.getvalue())
-                cv_text = extract_text_from_pdf(temp_path)
-                process_cv(cv_text, candidate_name, job_titles[selected_job], db, temp_dir)
+                # The PDF is written to temp_path (overwriting any earlier upload) only on a text cache miss
+                cv_text = extract_text_cached(uploaded_file.getvalue(), temp_path)
+                process_cv(cv_text, candidate_name, job_titles[selected_job], db, temp_dir, rescore)
     else:
         pasted_text = st.text_area("Paste CV text here:", height=300)
         if pasted_text and candidate_name and st.button("Analyze Text CV"):
             with st.spinner("Analyzing..."):
-                process_cv(pasted_text, candidate_name, job_titles[selected_job], db, temp_dir)
+                process_cv(pasted_text, candidate_name, job_titles[selected_job], db, temp_dir, rescore)
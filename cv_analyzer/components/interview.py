@@ -1,112 +1,186 @@
 import streamlit as st
 from datetime import datetime
-import whisper
-import torch
 import os
-import pyttsx4 as pyttsx
 import numpy as np
-import aiohttp
 import json
+import time
+import asyncio
+import logging
+import queue
 from st_audiorec import st_audiorec
+from transcription_service import get_transcription_service, TranscriptionBusy, TranscriptionError
+from llm_client import get_llm_client, KEEP_ALIVE
+from prompt_compaction import compact_cv
+from conversation_memory import ConversationMemory
+from stream_renderer import StreamRenderer
+from tts_service import get_tts_service, SentenceBuffer
+from streaming_transcriber import StreamingTranscriber
+from utils.audio_decode import decode_wav, AudioDecodeError
+from utils.json_stream import JsonStreamParser, JsonStreamError
+
+try:
+    from streamlit_webrtc import webrtc_streamer, WebRtcMode
+except ImportError:
+    # Live transcription is optional; recorded answers still work without it
+    webrtc_streamer = None
 
 class SpeechToText:
     def __init__(self):
-        cache_dir = os.path.expanduser("~/.cache/whisper")
-        os.makedirs(cache_dir, exist_ok=True)
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.model = whisper.load_model(
-            "base",
-            device=device,
-            download_root=cache_dir,
-            in_memory=True,
-        )
+        # Transcription runs in the shared worker pool, not on the Streamlit script thread
+        self.service = get_transcription_service()
         
     def transcribe(self, audio_data):
-        result = self.model.transcribe(audio_data)
-        return result["text"]
+        return self.service.transcribe(audio_data)
 
+# Interview turns are sent to /api/chat as one growing message list behind a system prompt that
+# never changes during the interview, so Ollama can reuse the KV cache for the shared prefix
 class InterviewManager:
     def __init__(self, cv_text, job_desc):
         self.cv_text = cv_text
         self.job_desc = job_desc
         self.conversation_history = []
+        self.memory = ConversationMemory(job_desc)
         self.current_question = None
-        
-    async def generate_question(self):
+        # Seconds from the end of each answer until the next question starts playing
+        self.turn_gaps = []
+        # (kind, seconds) from sending each request to its first streamed token
+        self.ttfts = []
+        self.system_prompt = self._system_prompt()
+
+    def _system_prompt(self):
         job_title = self.job_desc.split()[0]
-        prompt = f"""
+        return f"""
         Role: Senior Technical Interviewer specializing in {job_title} positions
-    
+
         System Requirements:
         - Track key competencies covered
         - Monitor response quality and depth
         - End interview when sufficient data gathered for all core skills
         - Minimum 3 questions, maximum 7 questions
         - Ensure balanced assessment across technical areas
-    
-        Context:
-        Job Requirements: {self.job_desc}
-        Previous Conversation: {self.conversation_history}
-        Questions Asked: {len([x for x in self.conversation_history if x[0] == "Interviewer"])}
-    
-        Instructions:
-        Generate ONE technical interview question that:
-        1. Maps directly to core {job_title} competencies
-        2. Progresses logically from previous responses
-        3. Tests both theoretical understanding and practical implementation
-        4. Requires specific examples from candidate's experience
-        5. Evaluates problem-solving methodology
-    
+
+        Job Requirements:
+        {self.job_desc}
+
+        Candidate CV:
+        {compact_cv(self.cv_text or '', self.job_desc)}
+
+        Interview Questions:
+        Each question must:
+        1. Map directly to core {job_title} competencies
+        2. Progress logically from previous responses
+        3. Test both theoretical understanding and practical implementation
+        4. Require specific examples from candidate's experience
+        5. Evaluate problem-solving methodology
+
         Question Parameters:
         - Must be specific and targeted
         - Should require 2-3 minute detailed response
         - Must evaluate both depth and breadth of knowledge
         - Should connect to real-world scenarios
-        - If sufficient data gathered, return [END_INTERVIEW] instead of question
-    
+        """
+
+    def _messages(self, instruction, history=None):
+        # Stable prefix (system prompt + turns) first; only the trailing instruction differs per call
+        history = self.conversation_history if history is None else history
+        return ([{"role": "system", "content": self.system_prompt}]
+                + self.memory.messages(history)
+                + [{"role": "user", "content": instruction}])
+
+    async def _stream_reply(self, kind, messages, placeholder=None, utterance=None, on_chunk=None, **kwargs):
+        # With an utterance, finished sentences go to speech synthesis while the rest still streams
+        started = time.perf_counter()
+        ttft = None
+        renderer = StreamRenderer(placeholder)
+        sentences = SentenceBuffer()
+
+        def speak(parts):
+            # The end marker is control text: it is dropped, and the words around it are still spoken
+            for sentence in parts:
+                sentence = sentence.replace('[END_INTERVIEW]', '').strip()
+                if sentence:
+                    utterance.add(sentence)
+
+        try:
+            async for chunk in get_llm_client().stream_chat(messages, keep_alive=KEEP_ALIVE, **kwargs):
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                renderer.add(chunk)
+                if on_chunk is not None:
+                    on_chunk(chunk)
+                if utterance is not None:
+                    speak(sentences.add(chunk))
+        finally:
+            reply = renderer.close()
+            if utterance is not None:
+                speak(sentences.flush())
+                utterance.close()
+        if ttft is not None:
+            self.ttfts.append((kind, ttft))
+            logging.info(f"Interview {kind} time to first token {ttft:.2f}s")
+        return reply
+
+    def last_ttft(self, kind):
+        return next((ttft for k, ttft in reversed(self.ttfts) if k == kind), None)
+
+    async def generate_question(self, render=True, speculative=False):
+        # A speculative (prefetched) call only reports [END_INTERVIEW] by returning None; ending the
+        # interview is left to the committed turn
+        questions_asked = len([x for x in self.conversation_history if x[0] == "Interviewer"])
+        instruction = f"""
+        Questions Asked: {questions_asked}
+
+        Generate the next interview question following the guidelines above.
+        If sufficient data gathered, return [END_INTERVIEW] instead of question.
+
         Output Format:
         Return ONLY the question or [END_INTERVIEW], no additional text or context.
         """
+
+        placeholder = st.empty() if render else None
+        question = await self._stream_reply("question", self._messages(instruction), placeholder)
     
-        question = ""
-        async with aiohttp.ClientSession() as session:
-            async with session.post('http://localhost:11434/api/generate',
-                                  json={
-                                      "model": "llama3.2",
-                                      "prompt": prompt,
-                                      "stream": True
-                                  }) as response:
-                placeholder = st.empty()
-                async for line in response.content:
-                    if line:
-                        data = json.loads(line)
-                        if 'response' in data:
-                            question += data['response']
-                            placeholder.write(question)
-            
-                if question.strip() == '[END_INTERVIEW]':
-                    st.session_state.interview_score = await self.generate_score()
-                    st.session_state.interview_active = False
-                    return None
-            
-                self.conversation_history.append(("Interviewer", question))
-                return question.strip()
-    async def process_response(self, response):
+        if question.strip() == '[END_INTERVIEW]':
+            if not speculative:
+                await self.end_interview(render=render)
+            return None
+    
+        self.conversation_history.append(("Interviewer", question))
+        self.memory.update(self.conversation_history)
+        return question.strip()
+
+    async def end_interview(self, render=True):
+        st.session_state.interview_score = await self.generate_score(render=render)
+        st.session_state.interview_active = False
+
+    def record_response(self, response):
         self.conversation_history.append(("Candidate", response))
-        prompt = f"""
+        self.memory.update(self.conversation_history)
+
+    def discard_prefetched_question(self, question_task):
+        # The feedback ended the interview, so the speculative next question is dropped
+        if not question_task.done():
+            question_task.cancel()
+        elif not question_task.cancelled() and question_task.exception() is None and question_task.result():
+            if self.conversation_history and self.conversation_history[-1][0] == "Interviewer":
+                self.conversation_history.pop()
+
+    async def process_response(self, response, record=True, prefetched_question=None, utterance=None):
+        if record:
+            self.record_response(response)
+        instruction = f"""
         Role: Technical Assessment Expert with 15+ years industry experience
-    
-        Analysis Target:
-        Candidate Response: {response}
-        Position Requirements: {self.job_desc}
-    
+
+        Give feedback on the candidate's last response:
+        {response}
+
         Evaluation Criteria:
         1. Technical Accuracy (Concepts, Terminology, Implementation)
         2. Problem-Solving Approach
         3. Communication Clarity
         4. Real-World Application
         5. Best Practices Awareness
-    
+
         Output Requirements:
         - One concise, actionable feedback paragraph
         - Maximum 3 sentences
@@ -114,40 +188,30 @@ class InterviewManager:
         - Balance positive aspects and improvement areas
         - Link directly to job requirements
         - If interview should end, start response with [END_INTERVIEW]
-    
+
         Format: Direct feedback only, no preamble or explanation.
         """
+
+        # Messages are built before the first await, so a prefetched question can't slip in ahead
+        comment = await self._stream_reply("feedback", self._messages(instruction), st.empty(), utterance)
     
-        comment = ""
-        async with aiohttp.ClientSession() as session:
-            async with session.post('http://localhost:11434/api/generate',
-                                  json={
-                                      "model": "llama3.2",
-                                      "prompt": prompt,
-                                      "stream": True
-                                  }) as response:
-                placeholder = st.empty()
-                async for line in response.content:
-                    if line:
-                        data = json.loads(line)
-                        if 'response' in data:
-                            comment += data['response']
-                            placeholder.write(comment)
-            
-                if comment.strip().startswith('[END_INTERVIEW]'):
-                    st.session_state.interview_score = await self.generate_score()
-                    st.session_state.interview_active = False
-                    return None
-            
-                return comment.strip()
+        if comment.strip().startswith('[END_INTERVIEW]'):
+            if prefetched_question is not None:
+                self.discard_prefetched_question(prefetched_question)
+            await self.end_interview()
+            return None
+    
+        return comment.strip()
 
-    async def generate_score(self):
+    async def generate_score(self, render=True):
         # Define the schema for structured interview scoring
         score_schema = {
             "type": "object",
             "properties": {
                 "score": {
-                    "type": "string",
+                    "type": "number",
+                    "minimum": 0,
+                    "maximum": 10,
                     "description": "Overall score out of 10"
                 },
                 "technical_strengths": {
@@ -176,86 +240,164 @@ class InterviewManager:
             "required": ["score", "technical_strengths", "areas_for_growth", "hiring_recommendation"]
         }
 
-        prompt = f"""
+        instruction = f"""
         Role: Chief Technical Officer conducting final candidate evaluation
-        
-        Complete Interview Transcript:
-        {self.conversation_history}
-        
-        Position Requirements:
-        {self.job_desc}
-        
+
+        The interview is over. Evaluate the candidate on the conversation above.
+
         Evaluation Framework:
         1. Technical Proficiency (0-10)
         2. Problem-Solving Methodology (0-10)
         3. Communication Effectiveness (0-10)
         4. Industry Knowledge (0-10)
         5. Growth Potential (0-10)
-        
+
         Provide a structured evaluation following the exact format specified.
         """
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post('http://localhost:11434/api/chat',
-                                  json={
-                                      "model": "llama3.2",
-                                      "prompt": prompt,
-                                      "format": score_schema,
-                                      "stream": False
-                                  }) as response:
-                result = await response.json()
-                return result['response']
+        # Parsed while it streams, so each field can be shown as soon as it closes
+        parser = JsonStreamParser()
+        view = EvaluationView() if render else None
+
+        def on_chunk(chunk):
+            for path, _ in parser.feed(chunk):
+                if view:
+                    view.update(path, parser.result)
+
+        try:
+            await self._stream_reply("score", self._messages(instruction), format=score_schema, on_chunk=on_chunk)
+            parser.close()
+        except JsonStreamError as e:
+            logging.error(f"Interview evaluation was not valid JSON: {str(e)}")
+            st.error("The evaluation could not be generated, please try again.")
+            return None
+        return parser.result
+
+# Shows an evaluation field by field; used both while it streams and for the finished result
+class EvaluationView:
+    def __init__(self):
+        st.subheader("Interview Assessment")
+        self.score = st.empty()
+        self.decision = st.empty()
+        self.strengths = st.empty()
+        self.growth = st.empty()
+
+    def _bullets(self, title, items):
+        return f"**{title}:**\n" + '\n'.join(f"- {item}" for item in items)
+
+    def update(self, path, evaluation):
+        field = path[0] if path else None
+        if not isinstance(evaluation, dict) or field not in evaluation:
+            return
+        value = evaluation[field]
+        if field == 'score' and isinstance(value, (int, float)):
+            self.score.metric("Score", f"{value:g}/10")
+        elif field == 'technical_strengths':
+            self.strengths.markdown(self._bullets("Strengths", value))
+        elif field == 'areas_for_growth':
+            self.growth.markdown(self._bullets("Areas for Growth", value))
+        elif field == 'hiring_recommendation' and isinstance(value, dict):
+            decision = value.get('decision', '')
+            justification = value.get('justification', '')
+            self.decision.markdown(f"**Recommendation:** {decision}" + (f" - {justification}" if justification else ''))
+
+    def show(self, evaluation):
+        for field in evaluation:
+            self.update((field,), evaluation)
+
 class Interview:
     def __init__(self):
         self.speech_to_text = SpeechToText()
-        os.makedirs('temp', exist_ok=True)
         os.makedirs('interviews', exist_ok=True)
+        self.tts = get_tts_service()
 
-    def text_to_speech(self, text):
-        engine = pyttsx.init()
-        engine.say(text)
-        engine.save_to_file(text, 'temp/question.mp3')
-        engine.runAndWait()
+    def text_to_speech(self, text, on_start=None):
+        # Returns immediately; the shared TTS worker synthesizes and plays in the background
+        return self.tts.speak(text, on_start)
 
     def get_transcription(self, audio_data):
         if audio_data is not None:
-            temp_file = "temp/temp_recording.wav"
-            with open(temp_file, 'wb') as f:
-                f.write(audio_data)
-            return self.speech_to_text.transcribe(temp_file)
+            # Decoded in memory straight to 16 kHz float32, so Whisper skips its ffmpeg step
+            try:
+                samples = decode_wav(audio_data)
+            except AudioDecodeError as e:
+                logging.error(f"Could not decode recording: {str(e)}")
+                st.error("Could not read the recording, please try again.")
+                return None
+            try:
+                return self.speech_to_text.transcribe(samples)
+            except TranscriptionBusy:
+                st.warning("The server is busy transcribing other answers. Please submit your answer again in a moment.")
+            except TranscriptionError as e:
+                logging.error(f"Transcription failed: {str(e)}")
+                st.error("Transcription failed, please try again.")
         return None
 
-    async def save_interview_analysis(self, db, candidate_id, job_id, analysis_text):
-        lines = analysis_text.split('\n')
-    
-        # More robust score extraction
-        try:
-            score_line = next(line for line in lines if line.strip().startswith('Score:'))
-            score = score_line.split(':', 1)[1].strip()
-        except StopIteration:
-            score = "0/10"  # Default score if not found
+    def _frame_samples(self, frame):
+        # av.AudioFrame -> mono float32 in [-1, 1]
+        samples = frame.to_ndarray()
+        channels = len(frame.layout.channels)
+        if frame.format.is_planar:
+            samples = samples.reshape(channels, -1).mean(axis=0)
+        else:
+            samples = samples.reshape(-1, channels).mean(axis=1)
+        if frame.format.name.startswith('s16'):
+            samples = samples / 32768.0
+        return samples.astype(np.float32)
+
+    def live_transcription(self):
+        # Streams microphone audio into a StreamingTranscriber while the candidate speaks and
+        # returns the final text on the rerun after they press stop
+        ctx = webrtc_streamer(
+            key="live-answer",
+            mode=WebRtcMode.SENDONLY,
+            audio_receiver_size=256,
+            media_stream_constraints={"audio": True, "video": False},
+        )
+        if ctx.state.playing:
+            if st.session_state.live_transcriber is None:
+                st.session_state.live_transcriber = StreamingTranscriber(self.speech_to_text.service)
+            transcriber = st.session_state.live_transcriber
+            partial = st.empty()
+            while ctx.state.playing:
+                try:
+                    frames = ctx.audio_receiver.get_frames(timeout=1)
+                except queue.Empty:
+                    continue
+                for frame in frames:
+                    transcriber.feed(self._frame_samples(frame), frame.sample_rate)
+                partial.caption(transcriber.text)
+            return None
+
+        transcriber = st.session_state.live_transcriber
+        if transcriber is None or not transcriber.has_audio:
+            return None
+        st.session_state.live_transcriber = None
+        text = transcriber.finish()
+        if transcriber.dropped_windows:
+            st.warning("Part of your answer could not be transcribed while the server was busy. "
+                       "Please check the transcript and answer again if needed.")
+        st.session_state.live_metrics = {
+            'real_time_factor': transcriber.real_time_factor,
+            'finalization_latency': transcriber.finalization_latency,
+        }
+        return text.strip() or None
+
+    async def save_interview_analysis(self, db, candidate_id, job_id, evaluation):
+        # The evaluation is already a parsed object, so fields are read directly
+        score_value = evaluation.get('score')
+        score_value = float(score_value) if isinstance(score_value, (int, float)) else None
+        score = f"{score_value:g}/10" if score_value is not None else "0/10"
+        if score_value is None:
             st.warning("Score not found in analysis - using default value")
-    
-        recommendation = next(line for line in lines if line.startswith('Recommendation:')).split(': ')[1]
-        is_hired = 'Hire' in recommendation.split()[0]
-    
-        # Format strengths and areas for growth
-        strengths = []
-        areas_growth = []
-        current_section = None
-    
-        for line in lines:
-            if 'Strengths:' in line:
-                current_section = 'strengths'
-            elif 'Areas for Growth:' in line:
-                current_section = 'growth'
-            elif line.strip().startswith('- '):
-                if current_section == 'strengths':
-                    strengths.append(line.strip()[2:])
-                elif current_section == 'growth':
-                    areas_growth.append(line.strip()[2:])
-    
-        # Create analysis summary
+        strengths = [str(item) for item in evaluation.get('technical_strengths', [])]
+        areas_growth = [str(item) for item in evaluation.get('areas_for_growth', [])]
+        hiring = evaluation.get('hiring_recommendation') or {}
+        decision = hiring.get('decision', 'NO HIRE')
+        justification = hiring.get('justification', '')
+        recommendation = f"{decision}: {justification}" if justification else decision
+        is_hired = decision == 'HIRE'
+
         analysis_summary = {
             'score': score,
             'strengths': strengths,
@@ -274,16 +416,56 @@ class Interview:
             strengths=', '.join(strengths),
             improvements=', '.join(areas_growth),
             recommendation=recommendation,
-            is_hired=is_hired
+            is_hired=is_hired,
+            score_value=score_value,
+            decision=decision,
+            justification=justification,
+            evaluation=json.dumps(evaluation)
         )
     
         return analysis_summary
 
+    async def run_turn(self, manager, transcription, answer_ended):
+        # answer_ended: perf_counter() when the recording stopped, before transcription
+        manager.record_response(transcription)
+        # The next question only depends on the answer, so it is generated while feedback streams and plays
+        question_task = asyncio.create_task(manager.generate_question(render=False, speculative=True))
+        try:
+            # Feedback is spoken sentence by sentence as it streams
+            utterance = self.tts.start_utterance()
+            feedback = await manager.process_response(transcription, record=False,
+                                                      prefetched_question=question_task,
+                                                      utterance=utterance)
+            if feedback is None:
+                # Closing feedback still plays out; the interview has already been ended
+                return
+            st.session_state.tts_active = True
+            await asyncio.to_thread(utterance.wait)
+            st.session_state.current_question = await question_task
+        finally:
+            if not question_task.done():
+                question_task.cancel()
+
+        if st.session_state.current_question is None:
+            # The prefetched question was [END_INTERVIEW]; only this committed turn ends the interview
+            await manager.end_interview()
+            return
+
+        def record_gap(started_at):
+            # The candidate's wait: end of their answer to the first audio of the next question
+            gap = started_at - answer_ended
+            manager.turn_gaps.append(gap)
+            logging.info(f"Turn gap {gap:.2f}s (answer end to next question audio)")
+
+        st.session_state.tts_active = True
+        self.text_to_speech(st.session_state.current_question, on_start=record_gap)
+
     async def render_interview_page(self, db):
         st.title("AI Interview Assessment")
         
         for key in ['interview_manager', 'current_question', 
-                   'interview_active', 'tts_active', 'interview_score']:
+                   'interview_active', 'tts_active', 'interview_score',
+                   'live_transcriber', 'live_metrics', 'interview_summary']:
             if key not in st.session_state:
                 st.session_state[key] = None
 
@@ -309,6 +491,8 @@ class Interview:
                         cv_text = db.get_candidate_cv(selected_candidate)
                         
                         st.session_state.interview_manager = InterviewManager(cv_text, job_desc)
+                        st.session_state.interview_score = None
+                        st.session_state.interview_summary = None
                         st.session_state.current_question = await st.session_state.interview_manager.generate_question()
                         
                         if st.session_state.current_question:
@@ -325,37 +509,58 @@ class Interview:
 
             st.write("Current Question:", st.session_state.current_question)
             
-            wav_audio_data = st_audiorec()
-            if wav_audio_data is not None:
-                transcription = self.get_transcription(wav_audio_data)
-                if transcription:
-                    st.write("Your Response:", transcription)
-                    response = await st.session_state.interview_manager.process_response(transcription)
-                    if response:
-                        st.session_state.tts_active = True
-                        self.text_to_speech(response)
-                    st.session_state.current_question = await st.session_state.interview_manager.generate_question()
-                    if st.session_state.current_question:
-                        st.session_state.tts_active = True
-                        self.text_to_speech(st.session_state.current_question)
-                    st.rerun()
+            load = self.speech_to_text.service.load()
+            if load['saturated']:
+                # submit() would reject the answer right now
+                st.warning("Transcription is at capacity. Please wait a moment and retry before recording.")
+            elif load['queue_depth'] >= load['workers']:
+                wait = load['mean_wait_seconds']
+                st.info(f"Transcription is busy ({load['queue_depth']} answers queued"
+                        f"{f', about {wait:.0f}s wait' if wait else ''}). Your answer will still be processed.")
+
+            live = webrtc_streamer is not None and st.checkbox(
+                "Live transcription", help="Transcribe while you speak instead of after recording")
+            answer_ended = time.perf_counter()
+            if live:
+                transcription = self.live_transcription()
+            else:
+                wav_audio_data = st_audiorec()
+                transcription = self.get_transcription(wav_audio_data) if wav_audio_data is not None else None
+            if transcription:
+                st.write("Your Response:", transcription)
+                await self.run_turn(st.session_state.interview_manager, transcription, answer_ended)
+                st.rerun()
 
             if st.session_state.interview_manager:
                 st.subheader("Interview Progress")
+                turn_gaps = st.session_state.interview_manager.turn_gaps
+                gap_col, ttft_col = st.columns(2)
+                if turn_gaps:
+                    gap_col.metric("Last turn gap", f"{turn_gaps[-1]:.1f}s",
+                                   help=f"Average {sum(turn_gaps) / len(turn_gaps):.1f}s over {len(turn_gaps)} turns")
+                question_ttft = st.session_state.interview_manager.last_ttft("question")
+                if question_ttft is not None:
+                    ttft_col.metric("Question time to first token", f"{question_ttft:.2f}s")
+                live_metrics = st.session_state.live_metrics
+                if live_metrics and live_metrics['real_time_factor'] is not None:
+                    rtf_col, final_col = st.columns(2)
+                    rtf_col.metric("Transcription real-time factor", f"{live_metrics['real_time_factor']:.2f}")
+                    final_col.metric("Transcript finalized in", f"{live_metrics['finalization_latency']:.2f}s")
                 for role, text in st.session_state.interview_manager.conversation_history:
                     st.markdown(f"**{'AI' if role == 'Interviewer' else 'You'}**: {text}")
 
         if st.session_state.interview_score:
-            st.subheader("Interview Assessment")
-            st.write(st.session_state.interview_score)
+            EvaluationView().show(st.session_state.interview_score)
             
-            # Save analysis after interview completion
-            analysis_summary = await self.save_interview_analysis(
-                db=db,
-                candidate_id=selected_candidate,
-                job_id=job_titles[selected_job],
-                analysis_text=st.session_state.interview_score
-            )
+            # Save analysis after interview completion, once per evaluation
+            if st.session_state.interview_summary is None:
+                st.session_state.interview_summary = await self.save_interview_analysis(
+                    db=db,
+                    candidate_id=selected_candidate,
+                    job_id=job_titles[selected_job],
+                    evaluation=st.session_state.interview_score
+                )
+            analysis_summary = st.session_state.interview_summary
             
             # Display save confirmation
             st.success("Interview analysis saved successfully!")
@@ -1,5 +1,7 @@
 import streamlit as st
 import pandas as pd
+import logging
+from embedding_index import get_embedding_index
 
 def render_jobs_page(db):
     st.title("Job Management")
@@ -8,7 +10,11 @@ def render_jobs_page(db):
         job_title = st.text_input("Job Title")
         job_description = st.text_area("Job Description")
         if st.form_submit_button("Add Job"):
-            db.add_job(job_title, job_description)
+            job_id = db.add_job(job_title, job_description)
+            try:
+                get_embedding_index().add_job(job_id, job_description)
+            except Exception as e:
+                logging.warning(f"Could not index job description: {str(e)}")
             st.success("Job added successfully!")
     
     jobs = db.get_all_jobs()
@@ -11,8 +11,9 @@ def render_rankings_page(db):
     if selected_job:
         candidates = db.get_candidates_by_job(job_titles[selected_job])
         if candidates:
-            df = pd.DataFrame(candidates, columns=["Name", "Score", "Analysis", "Date"])
-            df = df.sort_values(by="Score", ascending=False)
+            df = pd.DataFrame(candidates, columns=["Name", "Score", "Similarity", "Analysis", "Date"])
+            # Candidates that weren't shortlisted have no LLM score yet, only similarity
+            df = df.sort_values(by=["Score", "Similarity"], ascending=False, na_position="last")
             st.dataframe(df)
         else:
             st.info("No candidates analyzed for this job yet.")
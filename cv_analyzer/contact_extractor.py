@@ -0,0 +1,142 @@
+import re
+from dataclasses import dataclass
+
+CONTACT_FIELDS = ('name', 'email', 'phone', 'location')
+# Fields at or above this confidence are not sent to the LLM
+CONFIDENCE_THRESHOLD = 0.6
+# Contact details live in the CV header; scanning further mostly finds references
+HEADER_LINES = 15
+
+EMAIL_RE = re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}')
+PHONE_RE = re.compile(r'(?<![\w/])\+?\(?\d[\d\s().-]{6,18}\d(?![\w/])')
+PHONE_LABEL_RE = re.compile(r'\b(?:phone|mobile|mob|tel|telephone|cell|contact)\b', re.IGNORECASE)
+# A leading + or digit-group separators; a bare digit run could as easily be an ID or account number
+PHONE_FORMAT_RE = re.compile(r'^\+|\d[\s().-]+\d')
+LABELLED_FIELD_RE = re.compile(
+    r'^\s*(name|full name|location|address|city)\s*[:\-]\s*(.+?)\s*$', re.IGNORECASE | re.MULTILINE)
+NAME_LINE_RE = re.compile(r"^[A-Z][a-zA-Z'\-]+(?:\s+[A-Z][a-zA-Z'\-.]*){1,3}$")
+# Header lines made of these words are titles, not names
+NAME_STOPWORDS = {
+    'resume', 'curriculum', 'vitae', 'cv', 'profile', 'summary', 'engineer', 'developer', 'manager',
+    'analyst', 'designer', 'consultant', 'architect', 'scientist', 'senior', 'junior', 'lead',
+}
+# Everything after this heading belongs to someone else
+REFERENCES_HEADING_RE = re.compile(r'^\s*(?:references|referees)\b\s*:?\s*$', re.IGNORECASE)
+YEAR_RANGE_RE = re.compile(r'^(?:19|20)\d{2}\s*[-–]\s*(?:19|20)\d{2}$')
+
+# Small gazetteer of places that show up in our applicant pool
+GAZETTEER = (
+    'Bangalore', 'Bengaluru', 'Chennai', 'Delhi', 'New Delhi', 'Hyderabad', 'Kolkata', 'Mumbai', 'Pune',
+    'Noida', 'Gurgaon', 'Gurugram', 'Ahmedabad', 'Kochi', 'Dhaka', 'Chittagong', 'Karachi', 'Lahore',
+    'Colombo', 'Kathmandu', 'Dubai', 'Abu Dhabi', 'Doha', 'Riyadh', 'Singapore', 'Kuala Lumpur',
+    'London', 'Manchester', 'Dublin', 'Berlin', 'Munich', 'Amsterdam', 'Paris', 'Madrid', 'Lisbon',
+    'Toronto', 'Vancouver', 'New York', 'San Francisco', 'Seattle', 'Austin', 'Boston', 'Chicago',
+    'Sydney', 'Melbourne', 'Auckland', 'Nairobi', 'Lagos', 'Cairo',
+    'India', 'Bangladesh', 'Pakistan', 'Sri Lanka', 'Nepal', 'United Arab Emirates', 'UAE', 'Qatar',
+    'Saudi Arabia', 'Malaysia', 'United Kingdom', 'UK', 'Ireland', 'Germany', 'Netherlands', 'France',
+    'Spain', 'Portugal', 'Canada', 'United States', 'USA', 'Australia', 'New Zealand', 'Kenya',
+    'Nigeria', 'Egypt',
+)
+GAZETTEER_RE = re.compile(
+    r'\b(' + '|'.join(re.escape(place) for place in sorted(GAZETTEER, key=len, reverse=True)) + r')\b')
+
+@dataclass
+class FieldMatch:
+    value: str
+    confidence: float
+
+def _matches_name(email, name):
+    local = re.sub(r'[^a-z]', '', email.split('@')[0].lower())
+    return any(len(part) > 1 and part in local for part in re.findall(r'[a-z]+', (name or '').lower()))
+
+def _extract_email(header, body, name=None):
+    emails = list(dict.fromkeys(EMAIL_RE.findall(header)))
+    if emails:
+        named = [email for email in emails if _matches_name(email, name)]
+        if len(emails) == 1:
+            return FieldMatch(emails[0], 0.95)
+        # Several distinct addresses usually means someone else's is listed too
+        return FieldMatch(named[0], 0.9) if named else FieldMatch(emails[0], 0.5)
+    # Outside the header an address is as likely a referee's or a former employer's
+    for email in dict.fromkeys(EMAIL_RE.findall(body)):
+        if _matches_name(email, name):
+            return FieldMatch(email, 0.8)
+    emails = EMAIL_RE.findall(body)
+    return FieldMatch(emails[0], 0.4) if emails else None
+
+def _extract_phone(lines):
+    best = None
+    for line in lines:
+        for match in PHONE_RE.finditer(line):
+            candidate = match.group().strip()
+            digits = re.sub(r'\D', '', candidate)
+            if not 8 <= len(digits) <= 15 or YEAR_RANGE_RE.match(candidate):
+                continue
+            if PHONE_LABEL_RE.search(line):
+                confidence = 0.9
+            elif PHONE_FORMAT_RE.search(candidate):
+                confidence = 0.7
+            else:
+                # Below CONFIDENCE_THRESHOLD, so the LLM gets the final say
+                confidence = 0.4
+            if best is None or confidence > best.confidence:
+                best = FieldMatch(' '.join(candidate.split()), confidence)
+    return best
+
+def _extract_labelled(text):
+    labelled = {}
+    for label, value in LABELLED_FIELD_RE.findall(text):
+        field = 'name' if 'name' in label.lower() else 'location'
+        labelled.setdefault(field, FieldMatch(value, 0.9))
+    return labelled
+
+def _extract_name(lines):
+    for line in lines[:5]:
+        line = line.strip()
+        if not line or '@' in line or any(ch.isdigit() for ch in line):
+            continue
+        words = {word.lower() for word in line.split()}
+        if NAME_LINE_RE.match(line) and not GAZETTEER_RE.search(line) and not words & NAME_STOPWORDS:
+            return FieldMatch(line.title() if line.isupper() else line, 0.65)
+    return None
+
+def _extract_location(lines):
+    places = []
+    for line in lines:
+        places.extend(GAZETTEER_RE.findall(line))
+        if places:
+            # "City, Country" on one line is the common header layout
+            return FieldMatch(', '.join(dict.fromkeys(places)), 0.7 if len(places) > 1 else 0.6)
+    return None
+
+# Returns {field: FieldMatch} for whatever the regexes and gazetteer could find
+def extract_contact_fields(cv_text):
+    lines = []
+    for line in cv_text.splitlines()[:HEADER_LINES * 4]:
+        if REFERENCES_HEADING_RE.match(line):
+            break
+        if line.strip():
+            lines.append(line)
+    lines = lines[:HEADER_LINES]
+    header = '\n'.join(lines)
+    fields = _extract_labelled(header)
+
+    if 'name' not in fields:
+        name = _extract_name(lines)
+        if name:
+            fields['name'] = name
+    email = _extract_email(header, cv_text, fields['name'].value if 'name' in fields else None)
+    if email:
+        fields['email'] = email
+    phone = _extract_phone(lines)
+    if phone:
+        fields['phone'] = phone
+    if 'location' not in fields:
+        location = _extract_location(lines)
+        if location:
+            fields['location'] = location
+    return fields
+
+def unresolved_fields(fields, threshold=CONFIDENCE_THRESHOLD):
+    return [field for field in CONTACT_FIELDS
+            if field not in fields or fields[field].confidence < threshold]
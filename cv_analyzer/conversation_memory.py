@@ -0,0 +1,111 @@
+import json
+import logging
+import threading
+from llm_client import get_llm_client
+
+# Question/answer pairs kept verbatim; anything older is folded into the summary
+RECENT_TURNS = 2
+MAX_SUMMARY_ITEMS = 10
+
+SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "competencies_covered": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Skills or topics the interview has already assessed"
+        },
+        "evidence": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Concrete claims, examples or weaknesses the candidate showed"
+        },
+        "open_gaps": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Job requirements not yet covered"
+        }
+    },
+    "required": ["competencies_covered", "evidence", "open_gaps"]
+}
+
+def format_turns(entries):
+    return '\n'.join(f"{role}: {text.strip()}" for role, text in entries)
+
+# Keeps interview prompts roughly constant in size: the last RECENT_TURNS exchanges
+# verbatim plus a running structured summary of everything before them
+class ConversationMemory:
+    def __init__(self, job_desc, recent_turns=RECENT_TURNS):
+        self.job_desc = job_desc
+        self.recent_entries = recent_turns * 2
+        self.summary = {"competencies_covered": [], "evidence": [], "open_gaps": []}
+        self.folded = 0
+        self._pending = None
+        self._lock = threading.Lock()
+
+    def update(self, history):
+        # Called after every turn; the fold runs on the LLM client loop, off the request path.
+        # Folding waits until a full window of old turns has built up, so the summary (and the
+        # chat prefix that follows it) changes every few turns rather than on every turn.
+        cutoff = len(history) - self.recent_entries
+        with self._lock:
+            if cutoff - self.folded < self.recent_entries:
+                return
+            if self._pending is not None and not self._pending.done():
+                return
+            entries = list(history[self.folded:cutoff])
+            summary = dict(self.summary)
+            # Only schedules the fold on the client loop, so holding the lock here can't deadlock
+            self._pending = get_llm_client().submit(self._fold(summary, entries, cutoff))
+
+    async def _fold(self, summary, entries, cutoff):
+        prompt = f"""
+        You maintain running notes for a technical interview.
+
+        Position Requirements:
+        {self.job_desc}
+
+        Current notes (JSON):
+        {json.dumps(summary)}
+
+        New conversation to fold into the notes:
+        {format_turns(entries)}
+
+        Return the updated notes. Merge duplicates, keep each list to at most {MAX_SUMMARY_ITEMS} short items,
+        and keep specific evidence (technologies, numbers, examples) over general impressions.
+        """
+        try:
+            response = await get_llm_client().chat(
+                [{"role": "user", "content": prompt}],
+                format=SUMMARY_SCHEMA,
+                options={"temperature": 0.1}
+            )
+            data = json.loads(response)
+            updated = {key: [str(item) for item in data.get(key, [])][:MAX_SUMMARY_ITEMS]
+                       for key in SUMMARY_SCHEMA["properties"]}
+        except Exception as e:
+            # Nothing is lost: unfolded turns stay in the verbatim part of the prompt
+            logging.warning(f"Conversation summary update failed: {str(e)}")
+            return
+        with self._lock:
+            self.summary = updated
+            self.folded = cutoff
+        logging.info(f"Folded conversation up to entry {cutoff} into the running summary")
+
+    def _summary_text(self, summary):
+        return ("Summary of earlier conversation:\n"
+                f"Competencies covered: {'; '.join(summary['competencies_covered']) or 'none'}\n"
+                f"Evidence: {'; '.join(summary['evidence']) or 'none'}\n"
+                f"Not yet covered: {'; '.join(summary['open_gaps']) or 'unknown'}")
+
+    def messages(self, history):
+        # Summary then recent turns as chat messages: append-only between folds, so Ollama can reuse its KV cache
+        with self._lock:
+            summary = self.summary
+            folded = self.folded
+        messages = []
+        if folded:
+            messages.append({"role": "system", "content": self._summary_text(summary)})
+        for role, text in history[folded:]:
+            messages.append({"role": "assistant" if role == "Interviewer" else "user", "content": text.strip()})
+        return messages
@@ -1,9 +1,16 @@
+import os
+import json
 import PyPDF2
 import pytesseract
+from concurrent.futures import ThreadPoolExecutor
 from pdf2image import convert_from_path
 import logging
-from langchain.llms import Ollama
 from langchain.prompts import PromptTemplate
+from text_cache import get_text_cache
+from llm_cache import get_llm_cache
+from contact_extractor import CONTACT_FIELDS, extract_contact_fields, unresolved_fields
+from llm_client import get_llm_client, LLMError
+from prompt_compaction import compact_cv, compact_prompt_inputs, log_prompt_tokens
 
 # Configure logging
 logging.basicConfig(
@@ -12,41 +19,216 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-def extract_text_from_pdf(pdf_path):
+LLM_MODEL = "llama3.2"
+
+CONTACT_FIELD_PROMPTS = {
+    'name': "Name: [full name]",
+    'email': "Email: [email address]",
+    'phone': "Phone: [phone number]",
+    'location': "Location: [city/country]",
+}
+
+# Everything analyze_cv and extract_candidate_details produce, in one response
+CV_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "email": {"type": "string"},
+        "phone": {"type": "string"},
+        "location": {"type": "string"},
+        "score": {"type": "number", "minimum": 0, "maximum": 10},
+        "explanation": {"type": "string"}
+    },
+    "required": ["name", "email", "phone", "location", "score", "explanation"]
+}
+
+def _analysis_schema(fields):
+    properties = {key: CV_ANALYSIS_SCHEMA["properties"][key] for key in fields}
+    return {**CV_ANALYSIS_SCHEMA, "properties": properties, "required": list(fields)}
+
+# Bump whenever extraction output changes so cached text is not reused
+EXTRACTOR_VERSION = "2"
+
+# A page with less text than this is treated as scanned and sent to OCR
+MIN_PAGE_TEXT_CHARS = 25
+OCR_PAGE_TIMEOUT = 60
+OCR_WORKERS = os.cpu_count() or 1
+
+def _ocr_page(pdf_path, page_number):
+    # Rasterize only this page so at most ocr_workers page images are held at once
+    images = convert_from_path(pdf_path, first_page=page_number, last_page=page_number,
+                               timeout=OCR_PAGE_TIMEOUT)
+    if not images:
+        return ''
+    try:
+        return pytesseract.image_to_string(images[0], timeout=OCR_PAGE_TIMEOUT)
+    except RuntimeError as e:
+        # pytesseract raises RuntimeError when the timeout kills tesseract
+        logging.warning(f"OCR timed out on page {page_number} of {pdf_path}: {str(e)}")
+        return ''
+    finally:
+        for image in images:
+            image.close()
+
+def extract_text_from_pdf(pdf_path, ocr_workers=OCR_WORKERS):
+    # ocr_workers bounds concurrent tesseract/pdftoppm runs; callers already running in a
+    # process pool pass 1
     logging.info(f"Starting text extraction from: {pdf_path}")
     
-    # Try normal PDF text extraction first
+    # Try normal PDF text extraction first, deciding per page whether OCR is needed
+    page_texts = []
+    scanned_pages = []
     with open(pdf_path, 'rb') as file:
         pdf_reader = PyPDF2.PdfReader(file)
-        text = ''
         for page_num, page in enumerate(pdf_reader.pages):
-            page_text = page.extract_text()
-            text += page_text
-            logging.info(f"Extracted text from page {page_num + 1} using PyPDF2")
-    
-    # If extracted text is too short or empty, use OCR
-    if len(text.strip()) < 100:
-        logging.info("Insufficient text extracted, switching to OCR")
-        text = ''
-        # Convert PDF to images
-        images = convert_from_path(pdf_path)
-        for i, image in enumerate(images):
-            # Perform OCR on each image
-            page_text = pytesseract.image_to_string(image)
-            text += page_text
-            logging.info(f"Extracted text from page {i + 1} using OCR")
+            page_text = page.extract_text() or ''
+            page_texts.append(page_text)
+            if len(page_text.strip()) < MIN_PAGE_TEXT_CHARS:
+                scanned_pages.append(page_num)
+            else:
+                logging.info(f"Extracted text from page {page_num + 1} using PyPDF2")
+    
+    if scanned_pages:
+        logging.info(f"Running OCR on {len(scanned_pages)} of {len(page_texts)} pages")
+        workers = max(min(ocr_workers, len(scanned_pages)), 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {page_num: pool.submit(_ocr_page, pdf_path, page_num + 1)
+                       for page_num in scanned_pages}
+            for page_num, future in futures.items():
+                try:
+                    ocr_text = future.result()
+                except Exception as e:
+                    logging.error(f"OCR failed on page {page_num + 1}: {str(e)}")
+                    continue
+                # Keep whichever source produced more text for this page
+                if len(ocr_text.strip()) > len(page_texts[page_num].strip()):
+                    page_texts[page_num] = ocr_text
+                logging.info(f"Extracted text from page {page_num + 1} using OCR")
     
     logging.info("Text extraction completed")
+    return ''.join(page_texts)
+
+def extract_text_cached(pdf_bytes, pdf_path, write=True, ocr_workers=OCR_WORKERS):
+    # write=False when pdf_path is the file pdf_bytes were read from
+    cache = get_text_cache()
+    key = cache.make_key(pdf_bytes, EXTRACTOR_VERSION)
+    text = cache.get(key)
+    if text is not None:
+        logging.info(f"Text cache hit for {pdf_path}")
+        return text
+    
+    if write:
+        # Always rewrite: a re-upload under the same name may carry different content
+        with open(pdf_path, 'wb') as f:
+            f.write(pdf_bytes)
+    text = extract_text_from_pdf(pdf_path, ocr_workers)
+    cache.put(key, text)
     return text
 
-def analyze_cv(job_description, cv_text):
-    logging.info("Starting CV analysis")
+def call_llm(prompt, temperature, model=LLM_MODEL, bypass_cache=False, format=None, validate=None):
+    # validate(response) raises on an unusable response; such responses are never cached, and
+    # an unusable cached one (stored before validation existed) is fetched again
+    cache = get_llm_cache()
+    cache_prompt = prompt if format is None else prompt + json.dumps(format, sort_keys=True)
+    key = cache.make_key(model, temperature, cache_prompt)
+    if not bypass_cache:
+        cached = cache.get(key)
+        if cached is not None:
+            try:
+                if validate is not None:
+                    validate(cached)
+                logging.info("LLM cache hit, skipping Ollama request")
+                return cached
+            except (ValueError, KeyError, TypeError) as e:
+                logging.warning(f"Ignoring invalid cached LLM response: {str(e)}")
+    
+    response = get_llm_client().generate_sync(
+        prompt, model=model, options={"temperature": temperature}, format=format)
+    if validate is not None:
+        validate(response)
+    cache.put(key, model, response)
+    return response
+
+def _parse_structured_analysis(response):
+    # Raises ValueError/KeyError/TypeError for malformed, truncated or score-less JSON
+    data = json.loads(response)
+    data['score'] = min(max(float(data['score']), 0.0), 10.0)
+    return data
+
+def analyze_cv_structured(job_description, cv_text, bypass_cache=False):
+    logging.info("Starting single-pass structured CV analysis")
+    local_fields = extract_contact_fields(cv_text)
+    missing = unresolved_fields(local_fields)
+    requested = missing + ['score', 'explanation']
+    
+    extract_instruction = ""
+    if missing:
+        extract_instruction = (f"Extract the candidate's {', '.join(missing)} from the CV; "
+                               f"use \"Not found\" for any missing field.")
+    template = f"""
+    You are a professional Technical HR analyst. Analyze the following CV against the job description.
+    {extract_instruction}
+    Score the CV out of 10 against the job description and briefly explain the score.
+    
+    Job Description:
+    {{job_description}}
+    
+    CV Content:
+    {{cv_text}}
+    
+    Respond with a JSON object containing {', '.join(requested)}.
+    """
     
-    # First get candidate details
-    candidate_details = extract_candidate_details(cv_text)
+    prompt = PromptTemplate(
+        input_variables=["job_description", "cv_text"],
+        template=template,
+    )
+    
+    compact_job, compact_cv_text = compact_prompt_inputs(job_description, cv_text)
+    final_prompt = prompt.format(job_description=compact_job, cv_text=compact_cv_text)
+    log_prompt_tokens("Structured analysis", prompt.format(job_description=job_description, cv_text=cv_text),
+                      final_prompt)
+    response = call_llm(final_prompt, temperature=0.7, bypass_cache=bypass_cache,
+                        format=_analysis_schema(requested), validate=_parse_structured_analysis)
+    data = _parse_structured_analysis(response)
+    fields = {key: local_fields[key].value if key not in missing else str(data.get(key) or 'Not found').strip()
+              for key in CONTACT_FIELDS}
+    fields['score'] = data['score']
+    fields['explanation'] = str(data.get('explanation', '')).strip()
+    logging.info("Structured analysis completed")
+    return fields
+
+def analyze_cv_fields(job_description, cv_text, structured=True, bypass_cache=False):
+    if structured:
+        try:
+            return analyze_cv_structured(job_description, cv_text, bypass_cache=bypass_cache)
+        except (LLMError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"Structured analysis failed, falling back to two prompts: {str(e)}")
+    
+    result = analyze_cv(job_description, cv_text, bypass_cache=bypass_cache)
+    score, details = parse_analysis(result)
+    return {
+        'name': details.get('Name', 'Not found'),
+        'email': details.get('Email', 'Not found'),
+        'phone': details.get('Phone', 'Not found'),
+        'location': details.get('Location', 'Not found'),
+        'score': score,
+        'explanation': details.get('Explanation', result),
+    }
+
+def format_analysis(fields):
+    return (
+        f"Name: {fields['name']}\n"
+        f"Email: {fields['email']}\n"
+        f"Phone: {fields['phone']}\n"
+        f"Location: {fields['location']}\n\n"
+        f"Score: {fields['score']:g}/10\n"
+        f"Explanation: {fields['explanation']}"
+    )
+
+def analyze_cv(job_description, cv_text, bypass_cache=False):
+    logging.info("Starting CV analysis")
     
-    # Then do the regular analysis
-    llm = Ollama(model="llama3.2", temperature=0.7)
     template = """
     You are a professional Technical HR analyst. Analyze the following CV against the job description and provide a score out of 10.
     Also provide a brief explanation for the score.
@@ -67,39 +249,67 @@ def analyze_cv(job_description, cv_text):
         template=template,
     )
     
-    final_prompt = prompt.format(job_description=job_description, cv_text=cv_text)
+    compact_job, compact_cv_text = compact_prompt_inputs(job_description, cv_text)
+    final_prompt = prompt.format(job_description=compact_job, cv_text=compact_cv_text)
+    log_prompt_tokens("CV scoring", prompt.format(job_description=job_description, cv_text=cv_text), final_prompt)
     logging.info("Sending request to Ollama")
-    response = llm(final_prompt)
+    # Candidate details and scoring are independent prompts, so run them side by side
+    with ThreadPoolExecutor(max_workers=1) as detail_pool:
+        details_future = detail_pool.submit(extract_candidate_details, cv_text, bypass_cache)
+        response = call_llm(final_prompt, temperature=0.7, bypass_cache=bypass_cache)
+        candidate_details = details_future.result()
     
     # Combine the results
     full_response = f"{candidate_details}\n\n{response}"
     logging.info("Analysis completed with candidate details")
     return full_response
 
-def extract_candidate_details(cv_text):
+def extract_candidate_details(cv_text, bypass_cache=False, use_local=True):
     logging.info("Extracting candidate details")
-    llm = Ollama(model="llama3.2", temperature=0.1)
-    template = """
+    local_fields = extract_contact_fields(cv_text) if use_local else {}
+    missing = unresolved_fields(local_fields)
+    values = {key: match.value for key, match in local_fields.items() if key not in missing}
+    
+    if missing:
+        # Only ask the model for what the regexes and gazetteer couldn't resolve
+        field_lines = '\n    '.join(CONTACT_FIELD_PROMPTS[key] for key in missing)
+        template = f"""
     Extract the following information from the CV text. If any field is not found, return "Not found".
     Return the response in exactly this format:
-    Name: [full name]
-    Email: [email address]
-    Phone: [phone number]
-    Location: [city/country]
+    {field_lines}
 
     CV Content:
-    {cv_text}
+    {{cv_text}}
     """
+        
+        prompt = PromptTemplate(
+            input_variables=["cv_text"],
+            template=template,
+        )
+        
+        final_prompt = prompt.format(cv_text=compact_cv(cv_text, ''))
+        log_prompt_tokens("Candidate details", prompt.format(cv_text=cv_text), final_prompt)
+        response = call_llm(final_prompt, temperature=0.1, bypass_cache=bypass_cache)
+        _, details = parse_analysis(response)
+        for key in missing:
+            values[key] = details.get(key.capitalize(), 'Not found')
+    else:
+        logging.info("All candidate details resolved locally, skipping LLM")
     
-    prompt = PromptTemplate(
-        input_variables=["cv_text"],
-        template=template,
-    )
-    
-    final_prompt = prompt.format(cv_text=cv_text)
-    response = llm(final_prompt)
     logging.info("Extracted candidate details")
-    return response
+    return '\n'.join(f"{key.capitalize()}: {values[key]}" for key in CONTACT_FIELDS)
+
+def parse_analysis(result):
+    details = {}
+    for line in result.split('\n'):
+        if ':' in line:
+            key, value = line.split(':', 1)
+            details[key.strip()] = value.strip()
+    try:
+        score = float(details.get('Score', '0').split('/')[0])
+    except ValueError:
+        score = 0.0
+    return score, details
 
 def main():
     logging.info("Starting CV Analysis Program")
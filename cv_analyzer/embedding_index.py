@@ -0,0 +1,75 @@
+import hashlib
+import logging
+import os
+import threading
+import numpy as np
+import chromadb
+from chromadb.utils import embedding_functions
+from models import DB_PATH
+
+VECTOR_INDEX_PATH = os.path.join(os.path.dirname(DB_PATH), 'vector_index')
+# all-MiniLM-L6-v2 truncates at 256 word pieces, so long CVs are embedded in chunks
+CHUNK_WORDS = 180
+
+def text_id(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _chunks(text, size=CHUNK_WORDS):
+    words = text.split()
+    return [' '.join(words[i:i + size]) for i in range(0, len(words), size)] or ['']
+
+# CVs and job descriptions embedded with a local model (chromadb's bundled ONNX MiniLM)
+class EmbeddingIndex:
+    def __init__(self, path=VECTOR_INDEX_PATH):
+        self.lock = threading.Lock()
+        self.client = chromadb.PersistentClient(path=path)
+        self.embedding_function = embedding_functions.DefaultEmbeddingFunction()
+        self.cvs = self.client.get_or_create_collection("cvs", metadata={"hnsw:space": "cosine"})
+        self.jobs = self.client.get_or_create_collection("jobs", metadata={"hnsw:space": "cosine"})
+
+    def embed(self, text):
+        # Mean of the chunk embeddings, renormalized so dot product is cosine similarity
+        vectors = np.asarray(self.embedding_function(_chunks(text)), dtype=np.float32)
+        vector = vectors.mean(axis=0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _get_or_add(self, collection, doc_id, text, metadata):
+        with self.lock:
+            existing = collection.get(ids=[doc_id], include=["embeddings"])
+            if existing["ids"]:
+                return np.asarray(existing["embeddings"][0], dtype=np.float32)
+            vector = self.embed(text)
+            collection.add(ids=[doc_id], embeddings=[vector.tolist()],
+                           documents=[text[:2000]], metadatas=[metadata])
+            return vector
+
+    def add_job(self, job_id, description):
+        return self._get_or_add(self.jobs, job_id, description, {"job_id": job_id})
+
+    def add_cv(self, cv_text, name=None):
+        # CVs are keyed by content, so a re-uploaded CV is embedded once
+        return self._get_or_add(self.cvs, text_id(cv_text), cv_text, {"name": name or ""})
+
+    def similarity(self, job_id, job_description, cv_text, name=None):
+        job_vector = self.add_job(job_id, job_description)
+        cv_vector = self.add_cv(cv_text, name)
+        return float(np.dot(job_vector, cv_vector))
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_embedding_index():
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = EmbeddingIndex()
+    return _index
+
+def safe_similarity(job_id, job_description, cv_text, name=None):
+    # Pre-screening is advisory; a broken index must not block CV analysis
+    try:
+        return get_embedding_index().similarity(job_id, job_description, cv_text, name)
+    except Exception as e:
+        logging.warning(f"Embedding similarity unavailable: {str(e)}")
+        return None
@@ -1,9 +1,36 @@
 import cv2
 import mediapipe as mp
 import numpy as np
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, astuple
 import logging
 
+# MediaPipe pose landmark indices used below
+NOSE = 0
+LEFT_EYE, RIGHT_EYE = 2, 5
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_WRIST, RIGHT_WRIST = 15, 16
+LEFT_HIP, RIGHT_HIP = 23, 24
+UPPER_BODY = slice(0, 25)
+NUM_LANDMARKS = 33
+# Columns of a landmark array
+X, Y, Z, VISIBILITY = 0, 1, 2, 3
+MIN_VISIBILITY = 0.5
+
+# Deviations (in shoulder widths unless noted) at which each metric drops to 0
+SHOULDER_TILT_TOLERANCE = 0.15
+BACK_LEAN_TOLERANCE = 0.35       # horizontal/vertical ratio of the torso
+EYE_TILT_TOLERANCE = 0.25        # in eye distances
+HEAD_MOTION_TOLERANCE = 0.05     # per frame
+WRIST_MOTION_TOLERANCE = 0.15    # per frame
+BODY_MOTION_TOLERANCE = 0.03     # per frame
+HAND_FACE_DISTANCE = 0.6         # wrists closer than this to the nose read as touching the face
+LEAN_TOLERANCE = 0.35
+# "Last N seconds" views kept alongside the whole-session aggregates
+ROLLING_WINDOWS = (10, 60)
+# Upper bound on frames per second a rolling window has room for
+MAX_FRAME_RATE = 60
+
 @dataclass
 class InterviewMetrics:
     shoulder_alignment: float  # 0-10
@@ -14,7 +41,7 @@ class InterviewMetrics:
     overall_stability: float # 0-10
     hand_gesture_score: float # 0-10
     leaning_score: float    # 0-10
-    
+
     def get_total_score(self):
         weights = {
             'shoulder_alignment': 1.0,
@@ -26,50 +53,208 @@ class InterviewMetrics:
             'hand_gesture_score': 1.0,
             'leaning_score': 1.5
         }
-        
-        total = sum(getattr(self, metric) * weight 
+
+        total = sum(getattr(self, metric) * weight
                    for metric, weight in weights.items())
         return (total / sum(weights.values())) * 10  # Scale to 0-100
 
+    @classmethod
+    def from_array(cls, values):
+        return cls(*(float(value) for value in values))
+
+    def to_array(self):
+        return np.array(astuple(self), dtype=np.float32)
+
+METRIC_FIELDS = list(InterviewMetrics.__dataclass_fields__)
+
+def landmarks_to_array(pose_landmarks):
+    # One pass over the protobuf into a contiguous (33, 4) array of x, y, z, visibility
+    return np.array([(lm.x, lm.y, lm.z, lm.visibility) for lm in pose_landmarks.landmark], dtype=np.float32)
+
+def _score(deviation, tolerance):
+    return 10.0 * np.clip(1.0 - deviation / tolerance, 0.0, 1.0)
+
+def compute_metrics_batch(frames):
+    # frames: (N, 33, 4) consecutive landmark arrays -> (N, 8) scores in METRIC_FIELDS order.
+    # Motion metrics compare each frame with the one before it; the first frame counts as still.
+    frames = np.asarray(frames, dtype=np.float32)
+    xy = frames[..., :2]
+    visible = frames[..., VISIBILITY] >= MIN_VISIBILITY
+
+    left_shoulder, right_shoulder = xy[:, LEFT_SHOULDER], xy[:, RIGHT_SHOULDER]
+    shoulder_mid = (left_shoulder + right_shoulder) / 2
+    shoulder_width = np.maximum(np.linalg.norm(left_shoulder - right_shoulder, axis=-1), 1e-6)
+    nose = xy[:, NOSE]
+
+    shoulder_tilt = np.abs(left_shoulder[:, 1] - right_shoulder[:, 1]) / shoulder_width
+
+    # Torso from hip midpoint when hips are in view, otherwise neck from the nose
+    hip_mid = (xy[:, LEFT_HIP] + xy[:, RIGHT_HIP]) / 2
+    hips_visible = visible[:, LEFT_HIP] & visible[:, RIGHT_HIP]
+    lower = np.where(hips_visible[:, None], hip_mid, nose)
+    torso = shoulder_mid - lower
+    back_lean = np.abs(torso[:, 0]) / np.maximum(np.abs(torso[:, 1]), 1e-6)
+
+    eye_vector = xy[:, LEFT_EYE] - xy[:, RIGHT_EYE]
+    eye_tilt = np.abs(eye_vector[:, 1]) / np.maximum(np.linalg.norm(eye_vector, axis=-1), 1e-6)
+
+    motion = np.linalg.norm(np.diff(xy, axis=0, prepend=xy[:1]), axis=-1) / shoulder_width[:, None]
+    head_motion = motion[:, NOSE]
+    wrist_motion = np.where(visible[:, [LEFT_WRIST, RIGHT_WRIST]],
+                            motion[:, [LEFT_WRIST, RIGHT_WRIST]], 0.0).max(axis=1)
+    body_motion = motion[:, UPPER_BODY].mean(axis=1)
+
+    # Hidden hands are fine; hands held at the face are not
+    wrist_to_nose = np.linalg.norm(xy[:, [LEFT_WRIST, RIGHT_WRIST]] - nose[:, None], axis=-1) / shoulder_width[:, None]
+    wrist_to_nose = np.where(visible[:, [LEFT_WRIST, RIGHT_WRIST]], wrist_to_nose, np.inf).min(axis=1)
+    hand_score = 10.0 * np.clip((wrist_to_nose - HAND_FACE_DISTANCE) / HAND_FACE_DISTANCE, 0.0, 1.0)
+
+    lean = np.abs(nose[:, 0] - shoulder_mid[:, 0]) / shoulder_width
+
+    return np.stack([
+        _score(shoulder_tilt, SHOULDER_TILT_TOLERANCE),
+        _score(back_lean, BACK_LEAN_TOLERANCE),
+        _score(head_motion, HEAD_MOTION_TOLERANCE),
+        _score(eye_tilt, EYE_TILT_TOLERANCE),
+        _score(wrist_motion, WRIST_MOTION_TOLERANCE),
+        _score(body_motion, BODY_MOTION_TOLERANCE),
+        hand_score,
+        _score(lean, LEAN_TOLERANCE),
+    ], axis=1)
+
+def compute_metrics(current, previous=None):
+    # Single-frame form of compute_metrics_batch; `previous` feeds the motion metrics
+    frames = np.stack([current if previous is None else previous, current])
+    return InterviewMetrics.from_array(compute_metrics_batch(frames)[-1])
+
+# Welford running mean/variance plus min/max for a vector of metrics: O(1) memory and query
+class RunningStats:
+    def __init__(self, size):
+        self.count = 0
+        self.mean = np.zeros(size)
+        self._m2 = np.zeros(size)
+        self.min = np.full(size, np.inf)
+        self.max = np.full(size, -np.inf)
+
+    def update(self, values):
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (values - self.mean)
+        np.minimum(self.min, values, out=self.min)
+        np.maximum(self.max, values, out=self.max)
+
+    @property
+    def variance(self):
+        return self._m2 / (self.count - 1) if self.count > 1 else np.zeros_like(self.mean)
+
+# Mean over the last `seconds` of samples, kept in a preallocated ring with a running sum
+class RollingWindow:
+    def __init__(self, seconds, size, max_rate=MAX_FRAME_RATE):
+        self.seconds = seconds
+        self.capacity = int(seconds * max_rate)
+        self._times = np.zeros(self.capacity)
+        self._values = np.zeros((self.capacity, size))
+        self._sum = np.zeros(size)
+        self._start = 0
+        self.count = 0
+        self._pushes = 0
+        # Windows run on whatever clock the caller pushes with (wall clock or video position)
+        self._latest = None
+
+    def _drop_oldest(self):
+        self._sum -= self._values[self._start]
+        self._start = (self._start + 1) % self.capacity
+        self.count -= 1
+
+    def _evict(self, now):
+        while self.count and self._times[self._start] < now - self.seconds:
+            self._drop_oldest()
+
+    def push(self, timestamp, values):
+        self._evict(timestamp)
+        if self.count == self.capacity:
+            # Faster than max_rate: the window keeps the most recent `capacity` samples
+            self._drop_oldest()
+        index = (self._start + self.count) % self.capacity
+        self._times[index] = timestamp
+        self._values[index] = values
+        self._sum += values
+        self.count += 1
+        self._pushes += 1
+        self._latest = timestamp if self._latest is None else max(self._latest, timestamp)
+        if self._pushes % self.capacity == 0:
+            # Re-sum now and then so add/subtract rounding can't accumulate
+            indexes = (self._start + np.arange(self.count)) % self.capacity
+            self._sum = self._values[indexes].sum(axis=0)
+
+    def mean(self, now=None):
+        if now is None:
+            now = self._latest
+        if now is not None:
+            self._evict(now)
+        return self._sum / self.count if self.count else None
+
 class InterviewAnalyzer:
-    def __init__(self):
+    def __init__(self, windows=ROLLING_WINDOWS):
         self.mp_pose = mp.solutions.pose
         self.pose = self.mp_pose.Pose()
+        self.reset(windows)
+
+    def reset(self, windows=ROLLING_WINDOWS):
+        # Starts a new session on the same Pose graph, which is the expensive part to build
         self.frame_count = 0
-        self.posture_scores = []
-        
-    def analyze_frame(self, frame):
+        # Aggregates instead of a per-frame history, so memory doesn't grow with session length
+        self.stats = RunningStats(len(METRIC_FIELDS))
+        self.windows = {seconds: RollingWindow(seconds, len(METRIC_FIELDS)) for seconds in windows}
+        self.last_metrics = None
+        self._previous_landmarks = None
+
+    def close(self):
+        self.pose.close()
+
+    def analyze_frame(self, frame, timestamp=None, draw=True):
+        self.frame_count += 1
         results = self.pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
         if results.pose_landmarks:
             metrics = self._calculate_posture_metrics(results.pose_landmarks)
-            self.posture_scores.append(metrics)
-            return self._draw_landmarks(frame, results), metrics
+            self.record(metrics, timestamp)
+            return (self._draw_landmarks(frame, results) if draw else frame), metrics
+        # Motion after a gap is measured from the next detected frame, not a stale one
+        self._previous_landmarks = None
         return frame, None
-    
+
+    def record(self, metrics, timestamp=None):
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        values = metrics.to_array()
+        self.stats.update(values)
+        for window in self.windows.values():
+            window.push(timestamp, values)
+        self.last_metrics = metrics
+
     def _calculate_posture_metrics(self, landmarks):
-        # Calculate shoulder alignment
-        left_shoulder = np.array([landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_SHOULDER].x,
-                                landmarks.landmark[self.mp_pose.PoseLandmark.LEFT_SHOULDER].y])
-        right_shoulder = np.array([landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_SHOULDER].x,
-                                 landmarks.landmark[self.mp_pose.PoseLandmark.RIGHT_SHOULDER].y])
-        shoulder_alignment = abs(left_shoulder[1] - right_shoulder[1]) * 100
-        
-        # Add more metrics calculations here
-        
-        return PostureMetrics(
-            shoulder_alignment=shoulder_alignment,
-            head_position=0.0,  # Implement head position calculation
-            overall_stability=0.0  # Implement stability calculation
-        )
-    
+        current = landmarks_to_array(landmarks)
+        metrics = compute_metrics(current, self._previous_landmarks)
+        self._previous_landmarks = current
+        return metrics
+
     def _draw_landmarks(self, frame, results):
         mp.solutions.drawing_utils.draw_landmarks(
             frame, results.pose_landmarks, self.mp_pose.POSE_CONNECTIONS)
         return frame
-    
+
     def get_overall_score(self):
-        if not self.posture_scores:
+        # The total score is linear in the metrics, so the score of the means is the mean score
+        if not self.stats.count:
             return 0
-        avg_shoulder = np.mean([m.shoulder_alignment for m in self.posture_scores])
-        # Calculate other metrics
-        return max(0, 100 - avg_shoulder * 10)  # Simple scoring example
+        return InterviewMetrics.from_array(self.stats.mean).get_total_score()
+
+    def get_window_score(self, seconds, now=None):
+        mean = self.windows[seconds].mean(now)
+        return InterviewMetrics.from_array(mean).get_total_score() if mean is not None else None
+
+    def get_metric_summary(self):
+        std = np.sqrt(self.stats.variance)
+        return {field: {'mean': float(self.stats.mean[i]), 'std': float(std[i]),
+                        'min': float(self.stats.min[i]), 'max': float(self.stats.max[i])}
+                for i, field in enumerate(METRIC_FIELDS)} if self.stats.count else {}
@@ -0,0 +1,97 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from models import DB_PATH
+
+LLM_CACHE_PATH = os.path.join(os.path.dirname(DB_PATH), 'llm_cache.db')
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+
+# Model responses keyed by model, temperature and a hash of the rendered prompt
+class LLMCache:
+    def __init__(self, path=LLM_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.create_tables()
+
+    def create_tables(self):
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL,
+                last_access REAL
+            )
+        ''')
+        self.conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_llm_responses_access
+            ON llm_responses (last_access)
+        ''')
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(model, temperature, prompt):
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        return f"{model}:{temperature}:{prompt_hash}"
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT response, created_at FROM llm_responses WHERE key = ?', (key,)).fetchone()
+            if row and now - row[1] > self.ttl_seconds:
+                self.conn.execute('DELETE FROM llm_responses WHERE key = ?', (key,))
+                self.conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.conn.execute('UPDATE llm_responses SET last_access = ? WHERE key = ?', (now, key))
+            self.conn.commit()
+            self.hits += 1
+        return row[0]
+
+    def put(self, key, model, response):
+        now = time.time()
+        with self.lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO llm_responses (key, model, response, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (key, model, response, now, now))
+            self._evict(now)
+            self.conn.commit()
+
+    def _evict(self, now):
+        expired = self.conn.execute(
+            'DELETE FROM llm_responses WHERE created_at < ?', (now - self.ttl_seconds,)).rowcount
+        count = self.conn.execute('SELECT COUNT(*) FROM llm_responses').fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self.conn.execute('''
+                DELETE FROM llm_responses WHERE key IN (
+                    SELECT key FROM llm_responses ORDER BY last_access ASC LIMIT ?
+                )
+            ''', (overflow,))
+        if expired or overflow > 0:
+            logging.info(f"LLM cache evicted {expired} expired and {max(overflow, 0)} least recently used entries")
+
+    def stats(self):
+        with self.lock:
+            entries = self.conn.execute('SELECT COUNT(*) FROM llm_responses').fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+_llm_cache = None
+
+def get_llm_cache():
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMCache()
+    return _llm_cache
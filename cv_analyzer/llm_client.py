@@ -0,0 +1,316 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+import aiohttp
+
+try:
+    # Several times faster than json for the many small NDJSON lines in a stream
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+OLLAMA_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+DEFAULT_MODEL = "llama3.2"
+DEFAULT_TIMEOUT = 180
+CONNECT_TIMEOUT = 5
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+# How long Ollama keeps the model (and its KV cache) resident after a request
+KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+MAX_CONCURRENCY = int(os.environ.get("OLLAMA_MAX_CONCURRENCY", 4))
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+class LLMError(Exception):
+    pass
+
+@dataclass
+class RequestMetrics:
+    endpoint: str
+    model: str
+    attempts: int = 0
+    ttft: float = None
+    duration: float = None
+    tokens: int = 0
+    tokens_per_second: float = None
+    error: str = None
+    # The consumer stopped reading (e.g. a cancelled prefetch); not a request failure
+    cancelled: bool = False
+
+class LLMMetrics:
+    def __init__(self, history=500):
+        self.requests = deque(maxlen=history)
+        self.total_requests = 0
+        self.total_errors = 0
+        self.total_retries = 0
+        self.total_cancelled = 0
+
+    def record(self, metrics):
+        self.requests.append(metrics)
+        self.total_requests += 1
+        self.total_retries += max(metrics.attempts - 1, 0)
+        if metrics.error:
+            self.total_errors += 1
+        if metrics.cancelled:
+            self.total_cancelled += 1
+        logging.info(f"LLM {metrics.endpoint} model={metrics.model} attempts={metrics.attempts} "
+                     f"ttft={metrics.ttft if metrics.ttft is None else round(metrics.ttft, 3)}s "
+                     f"duration={metrics.duration:.3f}s tokens={metrics.tokens} "
+                     f"tok/s={metrics.tokens_per_second if metrics.tokens_per_second is None else round(metrics.tokens_per_second, 1)} "
+                     f"error={metrics.error} cancelled={metrics.cancelled}")
+
+    def last(self):
+        return self.requests[-1] if self.requests else None
+
+    def summary(self):
+        recent = list(self.requests)
+        ttfts = [m.ttft for m in recent if m.ttft is not None]
+        rates = [m.tokens_per_second for m in recent if m.tokens_per_second]
+        return {
+            'requests': self.total_requests,
+            'errors': self.total_errors,
+            'retries': self.total_retries,
+            'cancelled': self.total_cancelled,
+            'mean_ttft': sum(ttfts) / len(ttfts) if ttfts else None,
+            'mean_tokens_per_second': sum(rates) / len(rates) if rates else None,
+        }
+
+_DONE = object()
+
+def _post_to_loop(loop, queue, item):
+    # The caller's loop may already be gone (Streamlit reruns close it)
+    try:
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+    except RuntimeError:
+        pass
+
+# One pooled aiohttp session shared by every caller in the process. It lives on a private
+# event loop thread, so connections survive Streamlit reruns (each of which runs its own
+# asyncio.run loop) and synchronous code can use the same pool.
+class OllamaClient:
+    def __init__(self, base_url=OLLAMA_URL, model=DEFAULT_MODEL, max_concurrency=MAX_CONCURRENCY,
+                 timeout=DEFAULT_TIMEOUT, max_retries=MAX_RETRIES):
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.metrics = LLMMetrics()
+        self._start_lock = threading.Lock()
+        self._loop = None
+        self._session = None
+        self._semaphore = None
+        self._warmed = set()
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    self._reset_semaphore()
+                    ready.set()
+                    loop.run_forever()
+
+                threading.Thread(target=run, name="ollama-client", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+        return self._loop
+
+    def _reset_semaphore(self):
+        # Requests already holding the old semaphore finish under the old limit
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def set_max_concurrency(self, limit):
+        self.max_concurrency = limit
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._reset_semaphore)
+
+    def _get_session(self):
+        # Only called on the client loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency * 2, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def submit(self, coro):
+        # Run a coroutine on the client loop; returns a concurrent.futures.Future
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+    async def _stream_lines(self, endpoint, payload, timeout):
+        metrics = RequestMetrics(endpoint=endpoint, model=payload.get('model'))
+        started = time.perf_counter()
+        deadline = started + (timeout or self.timeout)
+        received_any = False
+        try:
+            async with self._semaphore:
+                while True:
+                    metrics.attempts += 1
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise LLMError(f"Deadline exceeded calling {endpoint}")
+                    client_timeout = aiohttp.ClientTimeout(total=remaining, sock_connect=CONNECT_TIMEOUT)
+                    try:
+                        async with self._get_session().post(f"{self.base_url}{endpoint}", json=payload,
+                                                            timeout=client_timeout) as response:
+                            if response.status in RETRYABLE_STATUS:
+                                raise aiohttp.ClientResponseError(
+                                    response.request_info, response.history, status=response.status,
+                                    message=await response.text())
+                            if response.status >= 400:
+                                raise LLMError(f"{endpoint} returned {response.status}: {await response.text()}")
+                            async for line in response.content:
+                                if not line.strip():
+                                    continue
+                                data = _loads(line)
+                                if 'error' in data:
+                                    raise LLMError(data['error'])
+                                text = data.get('response') or data.get('message', {}).get('content', '')
+                                if text:
+                                    if metrics.ttft is None:
+                                        metrics.ttft = time.perf_counter() - started
+                                    metrics.tokens += 1
+                                received_any = True
+                                if data.get('done') and data.get('eval_count') and data.get('eval_duration'):
+                                    metrics.tokens = data['eval_count']
+                                    metrics.tokens_per_second = data['eval_count'] / (data['eval_duration'] / 1e9)
+                                yield data
+                            return
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        # Partial output can't be replayed, so only retry before the first chunk
+                        if received_any or metrics.attempts > self.max_retries:
+                            raise LLMError(f"{endpoint} failed after {metrics.attempts} attempts: {e!r}") from e
+                        delay = min(self._backoff(metrics.attempts), max(deadline - time.perf_counter(), 0))
+                        logging.warning(f"Retrying {endpoint} in {delay:.2f}s after {type(e).__name__}: {e}")
+                        await asyncio.sleep(delay)
+        except (GeneratorExit, asyncio.CancelledError):
+            metrics.cancelled = True
+            raise
+        except BaseException as e:
+            metrics.error = repr(e)
+            raise
+        finally:
+            metrics.duration = time.perf_counter() - started
+            if metrics.tokens_per_second is None and metrics.tokens and metrics.ttft is not None:
+                generating = metrics.duration - metrics.ttft
+                metrics.tokens_per_second = metrics.tokens / generating if generating > 0 else None
+            self.metrics.record(metrics)
+
+    async def stream(self, endpoint, payload, timeout=None):
+        # Async iterator of parsed NDJSON objects, usable from any event loop
+        caller_loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        async def pump():
+            try:
+                async for data in self._stream_lines(endpoint, payload, timeout):
+                    _post_to_loop(caller_loop, queue, (data, None))
+            except BaseException as e:
+                _post_to_loop(caller_loop, queue, (None, e))
+                raise
+            _post_to_loop(caller_loop, queue, (_DONE, None))
+
+        future = self.submit(pump())
+        try:
+            while True:
+                data, error = await queue.get()
+                if error is not None:
+                    raise error
+                if data is _DONE:
+                    return
+                yield data
+        finally:
+            # Stops the request if the consumer bails out early
+            future.cancel()
+
+    def _generate_payload(self, prompt, model, options, format, keep_alive, system=None):
+        payload = {"model": model or self.model, "prompt": prompt, "stream": True}
+        if system:
+            payload["system"] = system
+        if options:
+            payload["options"] = options
+        if format:
+            payload["format"] = format
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        return payload
+
+    def _chat_payload(self, messages, model, options, format, keep_alive):
+        payload = {"model": model or self.model, "messages": messages, "stream": True}
+        if options:
+            payload["options"] = options
+        if format:
+            payload["format"] = format
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        return payload
+
+    async def stream_generate(self, prompt, model=None, options=None, format=None, keep_alive=None, timeout=None):
+        payload = self._generate_payload(prompt, model, options, format, keep_alive)
+        async for data in self.stream('/api/generate', payload, timeout):
+            if data.get('response'):
+                yield data['response']
+
+    async def stream_chat(self, messages, model=None, options=None, format=None, keep_alive=None, timeout=None):
+        payload = self._chat_payload(messages, model, options, format, keep_alive)
+        async for data in self.stream('/api/chat', payload, timeout):
+            content = data.get('message', {}).get('content')
+            if content:
+                yield content
+
+    async def generate(self, prompt, **kwargs):
+        return ''.join([chunk async for chunk in self.stream_generate(prompt, **kwargs)])
+
+    async def chat(self, messages, **kwargs):
+        return ''.join([chunk async for chunk in self.stream_chat(messages, **kwargs)])
+
+    def warm_up(self, model=None):
+        # Loads the model in the background once per process so the first real call skips the load
+        model = model or self.model
+        with self._start_lock:
+            if model in self._warmed:
+                return None
+            self._warmed.add(model)
+        payload = {"model": model, "keep_alive": KEEP_ALIVE}
+
+        async def load():
+            started = time.perf_counter()
+            async for _ in self._stream_lines('/api/generate', payload, None):
+                pass
+            logging.info(f"Warmed up {model} in {time.perf_counter() - started:.2f}s")
+
+        future = self.submit(load())
+        future.add_done_callback(
+            lambda f: f.cancelled() or f.exception() is None
+            or logging.warning(f"Model warm-up failed: {f.exception()}"))
+        return future
+
+    def generate_sync(self, prompt, model=None, options=None, format=None, keep_alive=None, timeout=None):
+        payload = self._generate_payload(prompt, model, options, format, keep_alive)
+
+        async def collect():
+            return ''.join([data.get('response', '') async for data in self._stream_lines('/api/generate', payload, timeout)])
+
+        return self.submit(collect()).result()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_llm_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OllamaClient()
+    return _client
@@ -2,9 +2,11 @@ import sqlite3
 import uuid
 from datetime import datetime
 
+DB_PATH = 'cv_analyzer.db'
+
 class Database:
     def __init__(self):
-        self.conn = sqlite3.connect('cv_analyzer.db')
+        self.conn = sqlite3.connect(DB_PATH)
         self.create_tables()
     
     def create_tables(self):
@@ -66,8 +68,51 @@ class Database:
                 FOREIGN KEY (job_id) REFERENCES jobs (id)
             )
         ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS ingest_progress (
+                job_id TEXT,
+                source_path TEXT,
+                status TEXT,
+                candidate_id TEXT,
+                error TEXT,
+                updated_at TIMESTAMP,
+                PRIMARY KEY (job_id, source_path),
+                FOREIGN KEY (candidate_id) REFERENCES candidates (id),
+                FOREIGN KEY (job_id) REFERENCES jobs (id)
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS interview_timeline (
+                session_id TEXT,
+                second INTEGER,
+                shoulder_alignment FLOAT,
+                back_straightness FLOAT,
+                head_stability FLOAT,
+                eye_level FLOAT,
+                fidget_score FLOAT,
+                overall_stability FLOAT,
+                hand_gesture_score FLOAT,
+                leaning_score FLOAT,
+                posture_score FLOAT,
+                face_count INTEGER,
+                PRIMARY KEY (session_id, second),
+                FOREIGN KEY (session_id) REFERENCES interview_sessions (id)
+            )
+        ''')
+        self.add_missing_column('candidates', 'similarity', 'FLOAT')
+        # Structured evaluation fields, stored as parsed instead of re-scanned from text
+        self.add_missing_column('interview_results', 'score_value', 'FLOAT')
+        self.add_missing_column('interview_results', 'decision', 'TEXT')
+        self.add_missing_column('interview_results', 'justification', 'TEXT')
+        self.add_missing_column('interview_results', 'evaluation', 'TEXT')
         self.conn.commit()
 
+    def add_missing_column(self, table, column, column_type):
+        # CREATE TABLE IF NOT EXISTS leaves older databases without new columns
+        columns = [row[1] for row in self.conn.execute(f'PRAGMA table_info({table})')]
+        if column not in columns:
+            self.conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}')
+
     def log_interview_session(self, candidate_id, job_id, status, cheating=False, recording_path=None, score=None, notes=None):
         session_id = str(uuid.uuid4())
         self.conn.execute('''
@@ -78,6 +123,34 @@ class Database:
         ''', (session_id, candidate_id, job_id, datetime.now(), 
               datetime.now(), status, cheating, recording_path, score, notes))
         self.conn.commit()
+        return session_id
+
+    def get_session_by_recording(self, recording_path):
+        row = self.conn.execute(
+            'SELECT id FROM interview_sessions WHERE recording_path = ? ORDER BY start_time DESC LIMIT 1',
+            (recording_path,)).fetchone()
+        return row[0] if row else None
+
+    def save_interview_timeline(self, session_id, rows, cheating=False):
+        # rows: (second, 8 metrics..., posture_score, face_count); re-analysis replaces earlier rows
+        self.conn.execute('DELETE FROM interview_timeline WHERE session_id = ?', (session_id,))
+        self.conn.executemany('''
+            INSERT INTO interview_timeline (
+                session_id, second, shoulder_alignment, back_straightness, head_stability, eye_level,
+                fidget_score, overall_stability, hand_gesture_score, leaning_score, posture_score, face_count
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(session_id, *row) for row in rows])
+        if cheating:
+            self.conn.execute('UPDATE interview_sessions SET cheating_detected = 1 WHERE id = ?', (session_id,))
+        self.conn.commit()
+
+    def get_interview_timeline(self, session_id):
+        cursor = self.conn.execute('''
+            SELECT second, shoulder_alignment, back_straightness, head_stability, eye_level, fidget_score,
+                   overall_stability, hand_gesture_score, leaning_score, posture_score, face_count
+            FROM interview_timeline WHERE session_id = ? ORDER BY second
+        ''', (session_id,))
+        return cursor.fetchall()
     def add_job(self, title, description):
         job_id = str(uuid.uuid4())
         self.conn.execute('''
@@ -87,18 +160,42 @@ class Database:
         self.conn.commit()
         return job_id
 
-    def add_candidate(self, job_id, name, cv_path, score, analysis, email=None, phone=None, location=None):
+    def add_candidate(self, job_id, name, cv_path, score, analysis, email=None, phone=None, location=None,
+                      similarity=None, source_path=None):
+        # source_path marks the batch source done in the same transaction, so a resumed batch
+        # can't store the candidate twice
         candidate_id = str(uuid.uuid4())
         self.conn.execute('''
             INSERT INTO candidates (
                 id, job_id, name, cv_path, score, analysis_result,
-                email, phone, location, created_at
+                email, phone, location, similarity, created_at
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (candidate_id, job_id, name, cv_path, score, analysis, 
-              email, phone, location, datetime.now()))
+              email, phone, location, similarity, datetime.now()))
+        if source_path is not None:
+            self._set_ingest_status(job_id, source_path, 'done', candidate_id, None)
         self.conn.commit()
         return candidate_id
+
+    def get_ingested_sources(self, job_id):
+        cursor = self.conn.execute('''
+            SELECT source_path FROM ingest_progress
+            WHERE job_id = ? AND status = 'done'
+        ''', (job_id,))
+        return {row[0] for row in cursor.fetchall()}
+
+    def mark_ingest_status(self, job_id, source_path, status, candidate_id=None, error=None):
+        self._set_ingest_status(job_id, source_path, status, candidate_id, error)
+        self.conn.commit()
+
+    def _set_ingest_status(self, job_id, source_path, status, candidate_id, error):
+        self.conn.execute('''
+            INSERT OR REPLACE INTO ingest_progress
+            (job_id, source_path, status, candidate_id, error, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (job_id, source_path, status, candidate_id, error, datetime.now()))
+
     def get_all_jobs(self):
         cursor = self.conn.execute('SELECT * FROM jobs ORDER BY created_at DESC')
         return cursor.fetchall()
@@ -109,10 +206,10 @@ class Database:
     
     def get_candidates_by_job(self, job_id):
         cursor = self.conn.execute('''
-            SELECT name, score, analysis_result, created_at 
+            SELECT name, score, similarity, analysis_result, created_at 
             FROM candidates 
             WHERE job_id = ?
-            ORDER BY score DESC
+            ORDER BY score DESC, similarity DESC
         ''', (job_id,))
         return cursor.fetchall()
 
@@ -136,20 +233,28 @@ class Database:
         ''', (interview_score, candidate_id))
         self.conn.commit()
     def save_interview_result(self, candidate_id, job_id, interview_date, score, 
-                            strengths, improvements, recommendation, is_hired, recording_path=None):
+                            strengths, improvements, recommendation, is_hired, recording_path=None,
+                            score_value=None, decision=None, justification=None, evaluation=None):
         result_id = str(uuid.uuid4())
         self.conn.execute('''
             INSERT INTO interview_results (
                 id, candidate_id, job_id, interview_date, score,
-                strengths, improvements, recommendation, is_hired, recording_path
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                strengths, improvements, recommendation, is_hired, recording_path,
+                score_value, decision, justification, evaluation
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         ''', (result_id, candidate_id, job_id, interview_date, score,
-              strengths, improvements, recommendation, is_hired, recording_path))
+              strengths, improvements, recommendation, is_hired, recording_path,
+              score_value, decision, justification, evaluation))
         self.conn.commit()
         return result_id
 
     def get_interview_results(self, candidate_id=None, job_id=None):
-        query = 'SELECT * FROM interview_results WHERE 1=1'
+        # Explicit columns: migrated databases have the newer ones appended in a different order
+        query = '''
+            SELECT id, candidate_id, job_id, interview_date, score, strengths, improvements,
+                   recommendation, is_hired, recording_path, score_value, decision, justification, evaluation
+            FROM interview_results WHERE 1=1
+        '''
         params = []
         
         if candidate_id:
@@ -0,0 +1,162 @@
+import logging
+import math
+import re
+
+CV_TOKEN_BUDGET = 1500
+JOB_TOKEN_BUDGET = 600
+# Rough chars-per-token for llama-style tokenizers on English text
+CHARS_PER_TOKEN = 4
+
+SECTION_HEADINGS = {
+    'summary': ('summary', 'profile', 'objective', 'about me', 'professional summary', 'career objective'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history'),
+    'skills': ('skills', 'technical skills', 'core skills', 'key skills', 'competencies', 'technologies',
+               'tools', 'tech stack'),
+    'projects': ('projects', 'personal projects', 'key projects'),
+    'education': ('education', 'academic background', 'qualifications', 'academics'),
+    'certifications': ('certifications', 'certificates', 'courses', 'training', 'licenses'),
+    'awards': ('awards', 'achievements', 'honours', 'honors', 'accomplishments'),
+    'publications': ('publications', 'research'),
+    'languages': ('languages',),
+    'interests': ('interests', 'hobbies'),
+    'references': ('references', 'referees'),
+}
+HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+# Relevance prior: what matters for scoring even when it shares few words with the job
+SECTION_PRIORS = {
+    'header': 10.0, 'skills': 3.0, 'experience': 3.0, 'projects': 2.0, 'summary': 1.5, 'education': 1.0,
+    'certifications': 1.0, 'awards': 0.5, 'publications': 0.5, 'languages': 0.2, 'interests': 0.0,
+    'references': -1.0,
+}
+MIN_RELEVANCE = 1.0
+PAGE_MARKER_RE = re.compile(r'^(?:page\s*\d+(?:\s*(?:of|/)\s*\d+)?|\d+\s*/\s*\d+|-\s*\d+\s*-)$', re.IGNORECASE)
+WORD_RE = re.compile(r'[a-z0-9+#.]{2,}')
+STOPWORDS = {
+    'and', 'the', 'for', 'with', 'you', 'our', 'are', 'will', 'have', 'from', 'this', 'that', 'your', 'who',
+    'all', 'can', 'not', 'but', 'has', 'was', 'were', 'able', 'work', 'working', 'team', 'years', 'year',
+    'experience', 'strong', 'good', 'knowledge', 'role', 'including', 'etc', 'using', 'within', 'such',
+}
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def normalize_whitespace(text):
+    lines = [' '.join(line.split()) for line in text.splitlines()]
+    normalized = []
+    for line in lines:
+        # Keep at most one blank line between blocks
+        if line or (normalized and normalized[-1]):
+            normalized.append(line)
+    return '\n'.join(normalized).strip()
+
+def dedupe_lines(text):
+    # Repeated page headers/footers and page markers only need to appear once
+    seen = set()
+    kept = []
+    for line in text.splitlines():
+        key = line.strip().lower()
+        if key and PAGE_MARKER_RE.match(key):
+            continue
+        if key and len(key) > 3 and key in seen:
+            continue
+        seen.add(key)
+        kept.append(line)
+    return '\n'.join(kept)
+
+def _heading(line):
+    key = line.strip().strip(':').strip().lower()
+    if len(key) > 40:
+        return None
+    return HEADING_LOOKUP.get(key)
+
+def segment_sections(text):
+    sections = [['header', []]]
+    for line in text.splitlines():
+        section = _heading(line)
+        if section:
+            sections.append([section, [line]])
+        else:
+            sections[-1][1].append(line)
+    return [(name, '\n'.join(lines).strip()) for name, lines in sections if '\n'.join(lines).strip()]
+
+def _terms(text):
+    return {word.strip('.') for word in WORD_RE.findall(text.lower())} - STOPWORDS
+
+def _relevance(name, body, job_terms):
+    overlap = len(_terms(body) & job_terms)
+    return SECTION_PRIORS.get(name, 0.5) + overlap / math.sqrt(max(len(job_terms), 1))
+
+def _cut_line(line, budget):
+    # Longest word-boundary prefix that fits; falls back to characters for one huge word
+    limit = max(budget, 1) * CHARS_PER_TOKEN
+    if len(line) <= limit:
+        return line
+    cut = line[:limit]
+    space = cut.rfind(' ')
+    return cut[:space].rstrip() if space > 0 else cut
+
+def _truncate(text, budget):
+    kept = []
+    used = 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            # Text without line breaks would otherwise compact to nothing
+            partial = _cut_line(line, budget - used - 1)
+            if partial and (not kept or used + estimate_tokens(partial) + 1 <= budget):
+                kept.append(partial)
+            break
+        kept.append(line)
+        used += cost
+    return '\n'.join(kept)
+
+def fit_to_budget(sections, job_terms, budget):
+    scores = [_relevance(name, body, job_terms) for name, body in sections]
+    ranked = sorted(range(len(sections)), key=lambda i: scores[i], reverse=True)
+    relevant = [i for i in ranked if scores[i] >= MIN_RELEVANCE]
+    selected = {}
+    remaining = budget
+
+    def take_whole(indexes):
+        nonlocal remaining
+        for i in indexes:
+            cost = estimate_tokens(sections[i][1]) + 1
+            if i not in selected and cost <= remaining:
+                selected[i] = sections[i][1]
+                remaining -= cost
+
+    # Whole relevant sections first, so one long section can't crowd out short ones
+    take_whole(relevant)
+    # Then the start of the most relevant sections that didn't fit
+    for i in relevant:
+        if i not in selected and remaining > 50:
+            selected[i] = _truncate(sections[i][1], remaining)
+            remaining -= estimate_tokens(selected[i]) + 1
+    # Low-relevance sections only if there is still room
+    take_whole(ranked)
+    # Reassemble in document order so the CV still reads naturally
+    return '\n\n'.join(selected[i] for i in sorted(selected) if selected[i])
+
+def compact_cv(cv_text, job_description, budget=CV_TOKEN_BUDGET):
+    cleaned = dedupe_lines(normalize_whitespace(cv_text))
+    if estimate_tokens(cleaned) <= budget:
+        return cleaned
+    return fit_to_budget(segment_sections(cleaned), _terms(job_description), budget)
+
+def compact_job_description(job_description, budget=JOB_TOKEN_BUDGET):
+    cleaned = dedupe_lines(normalize_whitespace(job_description))
+    if estimate_tokens(cleaned) <= budget:
+        return cleaned
+    return _truncate(cleaned, budget)
+
+def compact_prompt_inputs(job_description, cv_text, cv_budget=CV_TOKEN_BUDGET, job_budget=JOB_TOKEN_BUDGET):
+    compact_job = compact_job_description(job_description, job_budget)
+    compact_cv_text = compact_cv(cv_text, compact_job, cv_budget)
+    logging.info(f"Compacted prompt inputs: CV {estimate_tokens(cv_text)} -> {estimate_tokens(compact_cv_text)} tokens, "
+                 f"job description {estimate_tokens(job_description)} -> {estimate_tokens(compact_job)} tokens")
+    return compact_job, compact_cv_text
+
+def log_prompt_tokens(label, raw_prompt, final_prompt):
+    logging.info(f"{label} prompt tokens: {estimate_tokens(raw_prompt)} before compaction, "
+                 f"{estimate_tokens(final_prompt)} after")
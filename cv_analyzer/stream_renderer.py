@@ -0,0 +1,64 @@
+import logging
+import re
+import threading
+import time
+
+# Streamlit re-sends the whole text on every write, so updates are capped at this rate
+FRAME_INTERVAL = 0.1
+# Finished sentences are shown right away even between frames
+SENTENCE_END_RE = re.compile(r'[.!?:;]["\')\]]?\s*$|\n\s*$')
+
+class RenderStats:
+    def __init__(self):
+        self.streams = 0
+        self.chunks = 0
+        self.updates = 0
+        self._lock = threading.Lock()
+
+    def record(self, chunks, updates):
+        with self._lock:
+            self.streams += 1
+            self.chunks += chunks
+            self.updates += updates
+
+    @property
+    def saved_updates(self):
+        return self.chunks - self.updates
+
+render_stats = RenderStats()
+
+# Collects streamed tokens and writes them to a Streamlit placeholder at most once per frame,
+# or when a sentence ends, instead of once per token
+class StreamRenderer:
+    def __init__(self, placeholder, frame_interval=FRAME_INTERVAL):
+        self.placeholder = placeholder
+        self.frame_interval = frame_interval
+        self.text = ""
+        self.chunks = 0
+        self.updates = 0
+        self._pending = []
+        self._last_flush = time.perf_counter()
+
+    def add(self, chunk):
+        self._pending.append(chunk)
+        self.chunks += 1
+        if time.perf_counter() - self._last_flush >= self.frame_interval or SENTENCE_END_RE.search(chunk):
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        self.text += ''.join(self._pending)
+        self._pending.clear()
+        self._last_flush = time.perf_counter()
+        if self.placeholder is not None:
+            self.placeholder.write(self.text)
+            self.updates += 1
+
+    def close(self):
+        self.flush()
+        if self.placeholder is not None:
+            render_stats.record(self.chunks, self.updates)
+            logging.info(f"Rendered {self.chunks} chunks in {self.updates} UI updates "
+                         f"({self.chunks - self.updates} saved, {render_stats.saved_updates} this process)")
+        return self.text
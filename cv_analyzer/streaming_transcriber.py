@@ -0,0 +1,135 @@
+import logging
+import queue
+import re
+import threading
+import time
+import numpy as np
+from transcription_service import get_transcription_service, TranscriptionBusy
+from utils.audio_decode import SAMPLE_RATE, resample
+
+WINDOW_SECONDS = 10.0
+# Audio shared by consecutive windows so words cut at a boundary are heard whole once
+OVERLAP_SECONDS = 2.0
+# Longest run of repeated words looked for where two windows meet
+MAX_STITCH_WORDS = 12
+PROMPT_WORDS = 30
+# A window refused by a saturated transcription queue is retried this many times before it is dropped
+BUSY_RETRIES = 5
+BUSY_RETRY_DELAY = 0.5
+
+def _normalize(word):
+    return re.sub(r'\W', '', word.lower())
+
+def stitch(previous_words, new_words, max_overlap=MAX_STITCH_WORDS):
+    # Drops the words at the start of the new window that repeat the end of the previous one.
+    # A couple of leading words may be clipped fragments, so the match can start slightly late.
+    previous = [_normalize(word) for word in previous_words[-max_overlap:]]
+    new = [_normalize(word) for word in new_words[:max_overlap + 2]]
+    for skip in range(3):
+        for size in range(min(len(previous), len(new) - skip), 0, -1):
+            if previous[-size:] == new[skip:skip + size]:
+                return new_words[skip + size:]
+    return new_words
+
+# Transcribes an answer while it is being spoken: audio is cut into overlapping windows that a
+# background thread sends, in order, to the shared transcription service, so only the last
+# partial window is left when it ends
+class StreamingTranscriber:
+    def __init__(self, service=None, window_seconds=WINDOW_SECONDS, overlap_seconds=OVERLAP_SECONDS):
+        self.service = service or get_transcription_service()
+        self.window_seconds = window_seconds
+        self.overlap_seconds = overlap_seconds
+        self.words = []
+        self.audio_seconds = 0.0
+        self.processing_seconds = 0.0
+        self.windows = 0
+        self.dropped_windows = 0
+        self.finalization_latency = None
+        # Raw audio at the capture rate; resampled once per window rather than once per frame
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._rate = SAMPLE_RATE
+        self._queued = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="streaming-transcriber", daemon=True)
+        self._worker.start()
+
+    @property
+    def text(self):
+        with self._lock:
+            return ' '.join(self.words)
+
+    @property
+    def has_audio(self):
+        return self.audio_seconds > 0
+
+    @property
+    def real_time_factor(self):
+        # Seconds spent per second of audio, queueing included; above 1.0 the transcript falls behind the speaker
+        return self.processing_seconds / self.audio_seconds if self.audio_seconds else None
+
+    def feed(self, samples, sample_rate=SAMPLE_RATE):
+        samples = np.asarray(samples, dtype=np.float32)
+        with self._lock:
+            if sample_rate != self._rate:
+                # Rate changed mid-stream (new device); bring what is buffered to the new rate once
+                self._pending = resample(self._pending, self._rate, sample_rate)
+                self._rate = sample_rate
+            self._pending = np.concatenate([self._pending, samples])
+            self.audio_seconds += len(samples) / sample_rate
+            window = int(self.window_seconds * self._rate)
+            overlap = int(self.overlap_seconds * self._rate)
+            while len(self._pending) >= window:
+                self._queue.put(resample(self._pending[:window].copy(), self._rate))
+                self._queued += 1
+                self._pending = self._pending[window - overlap:]
+
+    def _transcribe(self, window, prompt):
+        # Live windows go through the same admission control as recorded answers
+        for attempt in range(BUSY_RETRIES + 1):
+            try:
+                return self.service.transcribe(window, initial_prompt=prompt)
+            except TranscriptionBusy:
+                if attempt == BUSY_RETRIES:
+                    raise
+                time.sleep(BUSY_RETRY_DELAY * 2 ** attempt)
+
+    def _run(self):
+        while True:
+            window = self._queue.get()
+            if window is None:
+                return
+            with self._lock:
+                prompt = ' '.join(self.words[-PROMPT_WORDS:]) or None
+            started = time.perf_counter()
+            try:
+                text = self._transcribe(window, prompt)
+            except Exception as e:
+                logging.error(f"Streaming transcription window failed: {str(e)}")
+                text = ""
+                with self._lock:
+                    self.dropped_windows += 1
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.processing_seconds += elapsed
+                self.windows += 1
+                self.words.extend(stitch(self.words, text.split()))
+
+    def finish(self):
+        # Only the unsent tail (at most one window) is left to transcribe after the answer ends
+        started = time.perf_counter()
+        with self._lock:
+            tail = self._pending
+            rate = self._rate
+            self._pending = np.zeros(0, dtype=np.float32)
+        # A tail no longer than the overlap was already heard at the end of the last window
+        if len(tail) > int(self.overlap_seconds * rate) or (self._queued == 0 and len(tail)):
+            self._queue.put(resample(tail, rate))
+        self._queue.put(None)
+        self._worker.join()
+        self.finalization_latency = time.perf_counter() - started
+        rtf = self.real_time_factor
+        logging.info(f"Streaming transcription: {self.audio_seconds:.1f}s audio in {self.windows} windows "
+                     f"({self.dropped_windows} dropped), "
+                     f"RTF {rtf if rtf is None else round(rtf, 2)}, finalized in {self.finalization_latency:.2f}s")
+        return self.text
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import streamlit as st
 import os
 from components.jobs import render_jobs_page
@@ -6,12 +7,15 @@ from components.cv_analysis import render_cv_page
 from components.rankings import render_rankings_page
 from components.interview import Interview
 from models import Database
+from llm_client import get_llm_client
 import logging
 import pandas as pd
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 interview = Interview()
+# Load the model in the background while the first page renders; no-op on later reruns
+get_llm_client().warm_up()
 
 # Constants
 TEMP_DIR = "temp"
@@ -22,6 +26,18 @@ os.makedirs(INTERVIEW_RECORDINGS_DIR, exist_ok=True)
 # Initialize database
 db = Database()
 
+def legacy_score_value(score):
+    try:
+        return float(str(score).split('/')[0])
+    except ValueError:
+        return None
+
+def evaluation_list(evaluation, key, column):
+    # A streamed evaluation can lack a field; fall back to the comma-joined column
+    if isinstance(evaluation, dict) and isinstance(evaluation.get(key), list):
+        return evaluation[key]
+    return column.split(', ') if column else []
+
 def render_interview_results():
     st.title("Interview Results Dashboard 📊")
     
@@ -42,7 +58,8 @@ def render_interview_results():
         # Convert to DataFrame for better display
         df = pd.DataFrame(results, columns=[
             'ID', 'Candidate ID', 'Job ID', 'Interview Date', 'Score',
-            'Strengths', 'Improvements', 'Recommendation', 'Hired', 'Recording'
+            'Strengths', 'Improvements', 'Recommendation', 'Hired', 'Recording',
+            'Score Value', 'Decision', 'Justification', 'Evaluation'
         ])
         
         # Display summary metrics
@@ -53,23 +70,28 @@ def render_interview_results():
             hired_count = len(df[df['Hired'] == True])
             st.metric("Candidates Hired", hired_count)
         with col3:
-            avg_score = df['Score'].apply(lambda x: float(x.split('/')[0])).mean()
-            st.metric("Average Score", f"{avg_score:.1f}/10")
+            # Older rows only have the "7/10" text score
+            scores = df['Score Value'].fillna(df['Score'].apply(legacy_score_value))
+            avg_score = scores.mean()
+            st.metric("Average Score", f"{avg_score:.1f}/10" if pd.notna(avg_score) else "n/a")
         
         # Display detailed results
         st.subheader("Interview Details")
         for _, row in df.iterrows():
+            evaluation = json.loads(row['Evaluation']) if row['Evaluation'] else None
             with st.expander(f"Interview on {row['Interview Date']} - Score: {row['Score']}"):
                 st.write("**Strengths:**")
-                for strength in row['Strengths'].split(', '):
+                strengths = evaluation_list(evaluation, 'technical_strengths', row['Strengths'])
+                for strength in strengths:
                     st.write(f"- {strength}")
                 
                 st.write("**Areas for Improvement:**")
-                for improvement in row['Improvements'].split(', '):
+                improvements = evaluation_list(evaluation, 'areas_for_growth', row['Improvements'])
+                for improvement in improvements:
                     st.write(f"- {improvement}")
                 
                 st.write("**Final Recommendation:**")
-                st.write(row['Recommendation'])
+                st.write(row['Justification'] or row['Recommendation'])
                 
                 if row['Recording']:
                     st.audio(row['Recording'])
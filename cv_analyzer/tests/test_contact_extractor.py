@@ -0,0 +1,20 @@
+from contact_extractor import CONFIDENCE_THRESHOLD, extract_contact_fields
+
+
+def test_header_email_is_confident():
+    fields = extract_contact_fields("Jane Doe\njane.doe@example.com\n+44 20 7946 0958\n\nExperience\nEngineer")
+    assert fields['email'].value == 'jane.doe@example.com'
+    assert fields['email'].confidence >= CONFIDENCE_THRESHOLD
+
+
+def test_referee_email_goes_to_llm():
+    fields = extract_contact_fields("Jane Doe\nReferences\nBob: bob@a.com")
+    assert fields['name'].value == 'Jane Doe'
+    assert fields['email'].value == 'bob@a.com'
+    assert fields['email'].confidence < CONFIDENCE_THRESHOLD
+
+
+def test_email_matching_name_wins_over_others():
+    fields = extract_contact_fields("Jane Doe\nhr@acme.com\njdoe@example.com")
+    assert fields['email'].value == 'jdoe@example.com'
+    assert fields['email'].confidence >= CONFIDENCE_THRESHOLD
@@ -0,0 +1,53 @@
+import json
+import pytest
+from utils.json_stream import JsonStreamParser, JsonStreamError
+
+DOCUMENT = json.dumps({
+    "score": 7.5,
+    "technical_strengths": ["Kafka", "tab\tand \"quotes\"", "café \U0001F600"],
+    "areas_for_growth": [],
+    "hiring_recommendation": {"decision": "HIRE", "justification": "Solid", "flags": [True, False, None]},
+    "nested": [[1, -2e3], {}],
+})
+
+def parse(chunks):
+    parser = JsonStreamParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    events.extend(parser.close())
+    return parser.result, events
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, len(DOCUMENT)])
+def test_any_chunk_size_gives_the_same_result(size):
+    result, _ = parse(DOCUMENT[i:i + size] for i in range(0, len(DOCUMENT), size))
+    assert result == json.loads(DOCUMENT)
+
+def test_split_inside_escapes_and_numbers():
+    text = json.dumps({"a": "é\n", "b": 12345})
+    for cut in range(1, len(text)):
+        assert parse([text[:cut], text[cut:]])[0] == json.loads(text)
+
+def test_fields_are_reported_as_they_complete():
+    parser = JsonStreamParser()
+    assert parser.feed('{"score": 7, "technical_strengths": ["Ka') == [(('score',), 7)]
+    assert parser.feed('fka"') == [(('technical_strengths', 0), 'Kafka')]
+    assert parser.result == {"score": 7, "technical_strengths": ["Kafka"]}
+
+def test_trailing_top_level_number_needs_close():
+    parser = JsonStreamParser()
+    assert parser.feed('42') == []
+    assert parser.close() == [((), 42)]
+
+@pytest.mark.parametrize('text', [
+    '{"a":}', '{"a" 1}', '{"a":1,}', '[1,]', '[1 2]', '{,}', '{"a":1]', '[1}', '}', '{"a":tru}',
+    '{"a":"\\x"}', '{"a":1} 2', '{1:2}',
+])
+def test_malformed_input_raises(text):
+    with pytest.raises(JsonStreamError):
+        parse([text])
+
+@pytest.mark.parametrize('text', ['{"a": 1', '["x"', '{"a": "unterminated', ''])
+def test_truncated_document_raises_on_close(text):
+    with pytest.raises(JsonStreamError):
+        parse([text])
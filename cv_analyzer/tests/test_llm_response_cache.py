@@ -0,0 +1,47 @@
+import pytest
+
+cv_analyzer = pytest.importorskip("cv_analyzer")
+from llm_cache import LLMCache
+
+class FakeClient:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def generate_sync(self, prompt, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0)
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = LLMCache(path=str(tmp_path / 'llm_cache.db'))
+    monkeypatch.setattr(cv_analyzer, 'get_llm_cache', lambda: cache)
+    return cache
+
+def use_client(monkeypatch, responses):
+    client = FakeClient(responses)
+    monkeypatch.setattr(cv_analyzer, 'get_llm_client', lambda: client)
+    return client
+
+@pytest.mark.parametrize('bad', ['{"score": 7, "expl', '{"explanation": "no score"}', '{"score": "high"}'])
+def test_invalid_structured_response_is_not_cached(cache, monkeypatch, bad):
+    client = use_client(monkeypatch, [bad, '{"score": 7, "explanation": "ok"}'])
+    validate = cv_analyzer._parse_structured_analysis
+
+    with pytest.raises((ValueError, KeyError)):
+        cv_analyzer.call_llm("prompt", 0.7, validate=validate)
+    assert cache.stats()['entries'] == 0
+
+    # The retry reaches the model again instead of replaying the bad response
+    assert cv_analyzer.call_llm("prompt", 0.7, validate=validate) == '{"score": 7, "explanation": "ok"}'
+    assert client.calls == 2
+    assert cv_analyzer.call_llm("prompt", 0.7, validate=validate) == '{"score": 7, "explanation": "ok"}'
+    assert client.calls == 2
+
+def test_invalid_cached_response_is_fetched_again(cache, monkeypatch):
+    key = cache.make_key(cv_analyzer.LLM_MODEL, 0.7, "prompt")
+    cache.put(key, cv_analyzer.LLM_MODEL, '{"score": ')
+    client = use_client(monkeypatch, ['{"score": 4}'])
+
+    assert cv_analyzer.call_llm("prompt", 0.7, validate=cv_analyzer._parse_structured_analysis) == '{"score": 4}'
+    assert client.calls == 1
@@ -0,0 +1,18 @@
+from prompt_compaction import compact_cv, compact_job_description, estimate_tokens
+
+ONE_LINE = ' '.join(['Senior Python developer with Django, PostgreSQL and AWS experience.'] * 200)
+
+def test_single_over_budget_line_is_cut_not_dropped():
+    compacted = compact_cv(ONE_LINE, 'python django', budget=300)
+    assert compacted
+    assert ONE_LINE.startswith(compacted)
+    assert estimate_tokens(compacted) <= 300
+
+def test_single_over_budget_job_description_is_cut_at_a_word():
+    compacted = compact_job_description(ONE_LINE, budget=100)
+    assert compacted
+    assert estimate_tokens(compacted) <= 100
+    assert ONE_LINE[len(compacted)] == ' '
+
+def test_unbroken_word_is_cut_by_characters():
+    assert compact_job_description('x' * 10000, budget=10)
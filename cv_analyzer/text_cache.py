@@ -0,0 +1,111 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from models import DB_PATH
+
+TEXT_CACHE_PATH = os.path.join(os.path.dirname(DB_PATH), 'cv_text_cache.db')
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Extracted CV text keyed by a hash of the PDF bytes and the extractor version
+class TextCache:
+    def __init__(self, path=TEXT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.create_tables()
+
+    def create_tables(self):
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS cv_text_cache (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL,
+                last_access REAL
+            )
+        ''')
+        self.conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_cv_text_cache_access
+            ON cv_text_cache (last_access)
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS cv_text_cache_stats (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        ''')
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(pdf_bytes, version):
+        return f"{hashlib.sha256(pdf_bytes).hexdigest()}:{version}"
+
+    def _bump(self, name, amount=1):
+        self.conn.execute('''
+            INSERT INTO cv_text_cache_stats (name, value) VALUES (?, ?)
+            ON CONFLICT(name) DO UPDATE SET value = value + excluded.value
+        ''', (name, amount))
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT text FROM cv_text_cache WHERE key = ?', (key,)).fetchone()
+            if row:
+                self.conn.execute(
+                    'UPDATE cv_text_cache SET last_access = ? WHERE key = ?', (time.time(), key))
+                self._bump('hits')
+            else:
+                self._bump('misses')
+            self.conn.commit()
+        return row[0] if row else None
+
+    def put(self, key, text):
+        size = len(text.encode('utf-8'))
+        now = time.time()
+        with self.lock:
+            self.conn.execute('''
+                INSERT OR REPLACE INTO cv_text_cache (key, text, size, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (key, text, size, now, now))
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM cv_text_cache').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        cursor = self.conn.execute('SELECT key, size FROM cv_text_cache ORDER BY last_access ASC')
+        for key, size in cursor.fetchall():
+            if total <= self.max_bytes:
+                break
+            self.conn.execute('DELETE FROM cv_text_cache WHERE key = ?', (key,))
+            total -= size
+            evicted += 1
+        self._bump('evictions', evicted)
+        logging.info(f"Text cache evicted {evicted} entries, {total} bytes remain")
+
+    def stats(self):
+        with self.lock:
+            counters = dict(self.conn.execute(
+                'SELECT name, value FROM cv_text_cache_stats').fetchall())
+            entries, size = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cv_text_cache').fetchone()
+        return {
+            'hits': counters.get('hits', 0),
+            'misses': counters.get('misses', 0),
+            'evictions': counters.get('evictions', 0),
+            'entries': entries,
+            'bytes': size,
+        }
+
+_text_cache = None
+
+def get_text_cache():
+    global _text_cache
+    if _text_cache is None:
+        _text_cache = TextCache()
+    return _text_cache
@@ -0,0 +1,236 @@
+import heapq
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from utils.audio_decode import SAMPLE_RATE
+
+TRANSCRIBE_WORKERS = int(os.environ.get("TRANSCRIBE_WORKERS", 2))
+TRANSCRIBE_QUEUE_SIZE = int(os.environ.get("TRANSCRIBE_QUEUE_SIZE", 16))
+# Seconds of queueing handicap per second of audio: short clips jump ahead of long ones,
+# but a long clip still gets served once it has waited this much longer
+LONG_CLIP_PENALTY = 0.5
+# Upper bound on how long a session blocks waiting for one transcription
+TRANSCRIBE_TIMEOUT = float(os.environ.get("TRANSCRIBE_TIMEOUT", 300))
+# Back-off between attempts to (re)start a worker that fails to come up
+WORKER_RESTART_BACKOFF_BASE = 1.0
+WORKER_RESTART_BACKOFF_MAX = 60.0
+
+class TranscriptionBusy(Exception):
+    pass
+
+class TranscriptionError(Exception):
+    pass
+
+def _worker_main(conn, model_name):
+    # Runs in a worker process; each worker holds its own copy of the model
+    from asr_models import get_whisper_model
+    model = get_whisper_model(model_name)
+    conn.send(('ready', None, 0.0))
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        samples, options = job
+        started = time.perf_counter()
+        try:
+            text = model.transcribe(samples, **options)["text"]
+            conn.send(('ok', text, time.perf_counter() - started))
+        except Exception as e:
+            conn.send(('error', repr(e), time.perf_counter() - started))
+
+class TranscriptionMetrics:
+    def __init__(self, history=200):
+        self.jobs = deque(maxlen=history)
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def record(self, audio_seconds, wait_seconds, processing_seconds, error=None):
+        rtf = processing_seconds / audio_seconds if audio_seconds else None
+        with self._lock:
+            self.jobs.append({'audio_seconds': audio_seconds, 'wait_seconds': wait_seconds,
+                              'processing_seconds': processing_seconds, 'real_time_factor': rtf})
+            if error:
+                self.failed += 1
+            else:
+                self.completed += 1
+        logging.info(f"Transcribed {audio_seconds:.1f}s clip: waited {wait_seconds:.2f}s, "
+                     f"took {processing_seconds:.2f}s (RTF {rtf if rtf is None else round(rtf, 2)}) error={error}")
+
+    def summary(self):
+        with self._lock:
+            jobs = list(self.jobs)
+        waits = [job['wait_seconds'] for job in jobs]
+        rtfs = [job['real_time_factor'] for job in jobs if job['real_time_factor'] is not None]
+        return {
+            'completed': self.completed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'mean_wait_seconds': sum(waits) / len(waits) if waits else None,
+            'mean_real_time_factor': sum(rtfs) / len(rtfs) if rtfs else None,
+        }
+
+# Transcription for every session in the process, served by a fixed set of worker processes.
+# Jobs wait in a bounded priority queue; each worker has a dispatcher thread feeding it one job
+# at a time, so the queue order (not the OS) decides who runs next.
+class TranscriptionService:
+    def __init__(self, workers=TRANSCRIBE_WORKERS, max_queue=TRANSCRIBE_QUEUE_SIZE, model_name=None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.model_name = model_name
+        self.metrics = TranscriptionMetrics()
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._busy = 0
+        self._ready = 0
+        self._start_failures = 0
+        self._context = multiprocessing.get_context('spawn')
+        for index in range(workers):
+            threading.Thread(target=self._dispatch, args=(index,), name=f"transcribe-dispatch-{index}",
+                             daemon=True).start()
+
+    def _start_worker(self, index):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_worker_main, args=(child_conn, self.model_name),
+                                        name=f"transcribe-worker-{index}", daemon=True)
+        process.start()
+        child_conn.close()
+        try:
+            # EOFError here means the worker died while loading the model
+            parent_conn.recv()
+        except BaseException:
+            parent_conn.close()
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+            raise
+        logging.info(f"Transcription worker {index} ready (pid {process.pid})")
+        return process, parent_conn
+
+    def _ensure_worker(self, index):
+        # Starts worker `index`, retrying with back-off; never raises, so the dispatcher survives
+        attempt = 0
+        while True:
+            try:
+                process, conn = self._start_worker(index)
+            except Exception as e:
+                attempt += 1
+                delay = min(WORKER_RESTART_BACKOFF_MAX, WORKER_RESTART_BACKOFF_BASE * 2 ** min(attempt - 1, 10))
+                logging.error(f"Transcription worker {index} failed to start ({e!r}); retrying in {delay:.0f}s")
+                with self._condition:
+                    self._start_failures += 1
+                    if not self._ready:
+                        # Nobody can serve the queue right now; fail it rather than leave callers hanging
+                        self._fail_queued(f"No transcription worker available: {e!r}")
+                time.sleep(delay)
+                continue
+            with self._condition:
+                self._ready += 1
+            return process, conn
+
+    def _fail_queued(self, message):
+        # Caller holds self._condition
+        while self._heap:
+            future = heapq.heappop(self._heap)[-1]
+            if future.set_running_or_notify_cancel():
+                future.set_exception(TranscriptionError(message))
+
+    def _dispatch(self, index):
+        process, conn = self._ensure_worker(index)
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                _, _, samples, options, submitted, future = heapq.heappop(self._heap)
+                self._busy += 1
+            audio_seconds = len(samples) / SAMPLE_RATE
+            dispatched = time.perf_counter()
+            wait_seconds = dispatched - submitted
+            crashed = False
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    conn.send((samples, options))
+                    status, payload, processing_seconds = conn.recv()
+                except (EOFError, OSError) as e:
+                    # The worker died mid-job (e.g. out of memory); replace it and fail only this job
+                    logging.error(f"Transcription worker {index} exited: {e!r}; restarting")
+                    status, payload, processing_seconds = 'error', repr(e), time.perf_counter() - dispatched
+                    crashed = True
+                if status == 'ok':
+                    self.metrics.record(audio_seconds, wait_seconds, processing_seconds)
+                    future.set_result(payload)
+                else:
+                    self.metrics.record(audio_seconds, wait_seconds, processing_seconds, error=payload)
+                    future.set_exception(TranscriptionError(payload))
+            finally:
+                with self._condition:
+                    self._busy -= 1
+            if crashed:
+                # The failed job is already resolved, so its caller isn't held up by the restart
+                with self._condition:
+                    self._ready -= 1
+                conn.close()
+                process.join(timeout=1)
+                process, conn = self._ensure_worker(index)
+
+    def submit(self, samples, **options):
+        # Returns a concurrent.futures.Future; raises TranscriptionBusy when the queue is full.
+        # `options` go to Whisper's transcribe(), e.g. initial_prompt.
+        audio_seconds = len(samples) / SAMPLE_RATE
+        submitted = time.perf_counter()
+        future = Future()
+        with self._condition:
+            if not self._ready and self._start_failures:
+                raise TranscriptionError("No transcription worker available")
+            if len(self._heap) >= self.max_queue:
+                self.metrics.rejected += 1
+                raise TranscriptionBusy(f"{len(self._heap)} transcriptions already queued")
+            priority = submitted + audio_seconds * LONG_CLIP_PENALTY
+            heapq.heappush(self._heap, (priority, next(self._sequence), samples, options, submitted, future))
+            self._condition.notify()
+        return future
+
+    def transcribe(self, samples, timeout=TRANSCRIBE_TIMEOUT, **options):
+        future = self.submit(samples, **options)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            # Drops the job if it is still queued; a running one finishes and is discarded
+            future.cancel()
+            raise TranscriptionError(f"Transcription timed out after {timeout:.0f}s")
+
+    def load(self):
+        # Snapshot for the UI to warn candidates before they record into a saturated server
+        with self._condition:
+            queued = len(self._heap)
+            busy = self._busy
+        return {
+            'queue_depth': queued,
+            'busy_workers': busy,
+            'workers': self.workers,
+            'ready_workers': self._ready,
+            'saturated': queued >= self.max_queue,
+            'mean_wait_seconds': self.metrics.summary()['mean_wait_seconds'],
+        }
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_transcription_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TranscriptionService()
+    return _service
@@ -0,0 +1,196 @@
+import hashlib
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import pyttsx4 as pyttsx
+from utils.audio_decode import read_wav
+
+try:
+    import sounddevice as sd
+except (ImportError, OSError):
+    # No audio device library: clips are still synthesized and cached, just not played
+    sd = None
+
+TTS_CACHE_DIR = os.environ.get("TTS_CACHE_DIR", "tts_cache")
+TTS_CACHE_MAX_FILES = int(os.environ.get("TTS_CACHE_MAX_FILES", 500))
+SENTENCE_END_RE = re.compile(r'(?<=[.!?])["\')\]]?\s+')
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in SENTENCE_END_RE.split(text) if sentence.strip()]
+
+# Cuts streamed text into whole sentences so each can be synthesized as soon as it ends
+class SentenceBuffer:
+    def __init__(self):
+        self._text = ""
+
+    def add(self, chunk):
+        self._text += chunk
+        boundaries = list(SENTENCE_END_RE.finditer(self._text))
+        if not boundaries:
+            return []
+        # Text after the last boundary may still be growing
+        end = boundaries[-1].end()
+        complete, self._text = self._text[:end], self._text[end:]
+        return split_sentences(complete)
+
+    def flush(self):
+        rest, self._text = self._text.strip(), ""
+        return [rest] if rest else []
+
+# One spoken reply: sentences are added as they become available and played in order
+class Utterance:
+    def __init__(self, service, on_start=None):
+        self.service = service
+        self.clips = []
+        self.cancelled = False
+        self.done = threading.Event()
+        # perf_counter() when the first clip starts playing; on_start(started_at) runs on the playback thread
+        self.started_at = None
+        self._on_start = on_start
+
+    def add(self, sentence):
+        if not self.cancelled:
+            self.service._synth_queue.put((self, sentence))
+
+    def close(self):
+        self.service._synth_queue.put((self, None))
+
+    def cancel(self):
+        self.cancelled = True
+        self.service._stop_if_playing(self)
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def _started(self):
+        if self.started_at is not None:
+            return
+        self.started_at = time.perf_counter()
+        if self._on_start is not None:
+            try:
+                self._on_start(self.started_at)
+            except Exception as e:
+                logging.error(f"Utterance start callback failed: {str(e)}")
+
+# Long-lived text-to-speech: one thread owns the pyttsx engine and renders sentences to cached
+# WAV clips named by a hash of voice settings and text; a second thread plays clips in order.
+# Neither runs on the Streamlit script thread or an event loop.
+class TTSService:
+    def __init__(self, cache_dir=TTS_CACHE_DIR, max_files=TTS_CACHE_MAX_FILES):
+        self.cache_dir = cache_dir
+        self.max_files = max_files
+        self.hits = 0
+        self.misses = 0
+        self.synth_seconds = 0.0
+        self._voice_key = None
+        self._playing = None
+        self._synth_queue = queue.Queue()
+        self._play_queue = queue.Queue()
+        os.makedirs(cache_dir, exist_ok=True)
+        threading.Thread(target=self._synthesize_loop, name="tts-synth", daemon=True).start()
+        threading.Thread(target=self._playback_loop, name="tts-playback", daemon=True).start()
+
+    def speak(self, text, on_start=None):
+        utterance = Utterance(self, on_start)
+        for sentence in split_sentences(text):
+            utterance.add(sentence)
+        utterance.close()
+        return utterance
+
+    def start_utterance(self):
+        return Utterance(self)
+
+    def _clip_path(self, text):
+        digest = hashlib.sha256(f"{self._voice_key}:{text}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.wav")
+
+    def _evict(self):
+        clips = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir) if name.endswith('.wav')]
+        if len(clips) <= self.max_files:
+            return
+        clips.sort(key=lambda path: os.path.getmtime(path))
+        for path in clips[:len(clips) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _synthesize(self, engine, text):
+        path = self._clip_path(text)
+        if os.path.exists(path):
+            self.hits += 1
+            # Refresh mtime so eviction drops the least recently used clips
+            os.utime(path)
+            return path
+        self.misses += 1
+        started = time.perf_counter()
+        # Rendered under a temporary name and renamed, so a reader never sees half a file
+        temp_path = f"{path[:-4]}.{os.getpid()}.tmp.wav"
+        engine.save_to_file(text, temp_path)
+        engine.runAndWait()
+        os.replace(temp_path, path)
+        self.synth_seconds += time.perf_counter() - started
+        logging.info(f"Synthesized {len(text)} chars in {time.perf_counter() - started:.2f}s "
+                     f"(cache hits {self.hits}, misses {self.misses})")
+        self._evict()
+        return path
+
+    def _synthesize_loop(self):
+        # pyttsx engines are not thread-safe, so this thread is the only one touching it
+        engine = pyttsx.init()
+        self._voice_key = f"{engine.getProperty('voice')}:{engine.getProperty('rate')}"
+        while True:
+            utterance, sentence = self._synth_queue.get()
+            if sentence is None:
+                self._play_queue.put((utterance, None))
+                continue
+            if utterance.cancelled:
+                continue
+            try:
+                path = self._synthesize(engine, sentence)
+            except Exception as e:
+                logging.error(f"Speech synthesis failed: {str(e)}")
+                continue
+            utterance.clips.append(path)
+            self._play_queue.put((utterance, path))
+
+    def _stop_if_playing(self, utterance):
+        if sd is not None and self._playing is utterance:
+            sd.stop()
+
+    def _playback_loop(self):
+        while True:
+            utterance, path = self._play_queue.get()
+            if path is None:
+                utterance.done.set()
+                continue
+            if utterance.cancelled:
+                continue
+            if sd is None:
+                # Nothing to play through; the clip being ready is as close as it gets to starting
+                utterance._started()
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    samples, sample_rate = read_wav(f.read())
+                self._playing = utterance
+                utterance._started()
+                sd.play(samples, sample_rate)
+                sd.wait()
+            except Exception as e:
+                logging.error(f"Speech playback failed: {str(e)}")
+            finally:
+                self._playing = None
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_tts_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TTSService()
+    return _service
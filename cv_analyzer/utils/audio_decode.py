@@ -0,0 +1,106 @@
+import io
+import struct
+import numpy as np
+
+try:
+    from scipy.signal import resample_poly
+except ImportError:
+    resample_poly = None
+
+# Whisper's expected input: mono float32 at 16 kHz
+SAMPLE_RATE = 16000
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+# Length of the windowed-sinc anti-aliasing filter used when scipy is unavailable
+LOWPASS_TAPS = 101
+
+class AudioDecodeError(ValueError):
+    pass
+
+def _lowpass(samples, cutoff):
+    # Hamming-windowed sinc FIR; cutoff is a fraction of the Nyquist frequency
+    n = np.arange(LOWPASS_TAPS) - (LOWPASS_TAPS - 1) / 2
+    kernel = cutoff * np.sinc(cutoff * n) * np.hamming(LOWPASS_TAPS)
+    kernel /= kernel.sum()
+    return np.convolve(samples, kernel.astype(np.float32), mode='same')
+
+def resample(samples, source_rate, target_rate=SAMPLE_RATE):
+    samples = samples.astype(np.float32, copy=False)
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    if resample_poly is not None:
+        # Polyphase filter: anti-aliased, and exact for ratios like 48k -> 16k
+        divisor = np.gcd(int(source_rate), int(target_rate))
+        return resample_poly(samples, target_rate // divisor, source_rate // divisor).astype(np.float32)
+    if target_rate < source_rate:
+        # Without this, content above the new Nyquist frequency folds back into the speech band
+        samples = _lowpass(samples, target_rate / source_rate)
+    duration = len(samples) / source_rate
+    target_positions = np.arange(int(duration * target_rate)) / target_rate
+    source_positions = np.arange(len(samples)) / source_rate
+    return np.interp(target_positions, source_positions, samples).astype(np.float32)
+
+def _pcm_to_float(data, bits):
+    if bits == 8:
+        return (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+    if bits == 16:
+        return np.frombuffer(data, dtype='<i2').astype(np.float32) / 32768
+    if bits == 24:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+        # Sign-extend the 3-byte little-endian samples into int32
+        values = (raw[:, 0].astype(np.int32) | (raw[:, 1].astype(np.int32) << 8)
+                  | (raw[:, 2].astype(np.int32) << 16))
+        values = np.where(values & 0x800000, values - 0x1000000, values)
+        return values.astype(np.float32) / 8388608
+    if bits == 32:
+        return np.frombuffer(data, dtype='<i4').astype(np.float32) / 2147483648
+    raise AudioDecodeError(f"Unsupported PCM bit depth: {bits}")
+
+def read_wav(wav_bytes):
+    # Parses RIFF/WAVE bytes in process, without a temp file or an ffmpeg subprocess.
+    # Returns mono float32 samples at the file's own rate.
+    stream = io.BytesIO(wav_bytes)
+    header = stream.read(12)
+    if len(header) < 12 or header[:4] != b'RIFF' or header[8:12] != b'WAVE':
+        raise AudioDecodeError("Not a RIFF/WAVE file")
+
+    fmt = None
+    data = None
+    while True:
+        chunk_header = stream.read(8)
+        if len(chunk_header) < 8:
+            break
+        chunk_id, size = struct.unpack('<4sI', chunk_header)
+        body = stream.read(size)
+        if size % 2:
+            stream.read(1)
+        if chunk_id == b'fmt ':
+            fmt = body
+        elif chunk_id == b'data':
+            # Some recorders write a placeholder size while streaming; use what is there
+            data = body
+            break
+
+    if fmt is None or data is None:
+        raise AudioDecodeError("WAV file is missing its fmt or data chunk")
+    format_tag, channels, sample_rate, _, block_align, bits = struct.unpack('<HHIIHH', fmt[:16])
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        format_tag = struct.unpack('<H', fmt[24:26])[0]
+
+    data = data[:len(data) - len(data) % block_align] if block_align else data
+    if format_tag == WAVE_FORMAT_PCM:
+        samples = _pcm_to_float(data, bits)
+    elif format_tag == WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+        samples = np.frombuffer(data, dtype='<f4' if bits == 32 else '<f8').astype(np.float32)
+    else:
+        raise AudioDecodeError(f"Unsupported WAV format {format_tag} with {bits} bits")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+def decode_wav(wav_bytes, target_rate=SAMPLE_RATE):
+    samples, sample_rate = read_wav(wav_bytes)
+    return resample(samples, sample_rate, target_rate)
@@ -0,0 +1,155 @@
+import json
+
+WHITESPACE = ' \t\r\n'
+ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+class JsonStreamError(ValueError):
+    pass
+
+# Incremental JSON parser for streamed model output. feed() takes text chunks of any size and
+# returns (path, value) for every value that finished in them, e.g. (('score',), 7) or
+# (('technical_strengths', 0), 'Kafka'). Containers are attached to the partial result as soon
+# as they open, so `result` always holds everything parsed so far.
+class JsonStreamParser:
+    def __init__(self):
+        self.result = None
+        self.done = False
+        # Open containers as [container, path, pending_key]
+        self._stack = []
+        self._expect = 'value'
+        self._string = None
+        self._string_is_key = False
+        self._escape = None
+        self._scalar = None
+
+    def feed(self, chunk):
+        events = []
+        for char in chunk:
+            self._feed_char(char, events)
+        return events
+
+    def close(self):
+        # Flushes a trailing top-level number or literal; complains if the document is unfinished
+        events = []
+        if self._scalar is not None:
+            self._finish_scalar(events)
+        if not self.done:
+            raise JsonStreamError("JSON document ended early")
+        return events
+
+    def _feed_char(self, char, events):
+        if self._string is not None:
+            self._feed_string(char, events)
+            return
+        if self._scalar is not None:
+            if char not in WHITESPACE and char not in ',]}':
+                self._scalar.append(char)
+                return
+            self._finish_scalar(events)
+        if char in WHITESPACE:
+            return
+        if self.done:
+            raise JsonStreamError(f"Unexpected {char!r} after the JSON document")
+
+        if char == '"':
+            if self._expect not in ('value', 'key'):
+                raise JsonStreamError(f"Unexpected string, expected {self._expect}")
+            self._string = []
+            self._string_is_key = self._expect == 'key'
+        elif char in '{[':
+            self._expect_value(char)
+            container = {} if char == '{' else []
+            path = self._attach(container)
+            self._stack.append([container, path, None])
+            self._expect = 'key' if char == '{' else 'value'
+        elif char in '}]':
+            if not self._stack or isinstance(self._stack[-1][0], dict) != (char == '}'):
+                raise JsonStreamError(f"Unbalanced {char!r}")
+            if self._expect != 'separator' and not self._may_close():
+                raise JsonStreamError(f"Unexpected {char!r}")
+            container, path, _ = self._stack.pop()
+            self._completed(path, container, events)
+        elif char == ':':
+            if self._expect != 'colon':
+                raise JsonStreamError("Unexpected ':'")
+            self._expect = 'value'
+        elif char == ',':
+            if self._expect != 'separator' or not self._stack:
+                raise JsonStreamError("Unexpected ','")
+            self._expect = 'key' if isinstance(self._stack[-1][0], dict) else 'value'
+        else:
+            self._expect_value(char)
+            self._scalar = [char]
+
+    def _may_close(self):
+        # Only an empty container may close straight after opening; never after ',' or ':'
+        container = self._stack[-1][0]
+        expected = 'key' if isinstance(container, dict) else 'value'
+        return self._expect == expected and not container
+
+    def _expect_value(self, char):
+        if self._expect != 'value':
+            raise JsonStreamError(f"Unexpected {char!r}, expected {self._expect}")
+
+    def _feed_string(self, char, events):
+        if self._escape is not None:
+            if self._escape == '':
+                if char == 'u':
+                    self._escape = 'u'
+                    return
+                if char not in ESCAPES:
+                    raise JsonStreamError(f"Invalid escape \\{char}")
+                self._string.append(ESCAPES[char])
+                self._escape = None
+                return
+            self._escape += char
+            if len(self._escape) == 5:
+                code = int(self._escape[1:], 16)
+                previous = ord(self._string[-1]) if self._string else 0
+                if 0xDC00 <= code <= 0xDFFF and 0xD800 <= previous <= 0xDBFF:
+                    # Second half of a surrogate pair
+                    self._string[-1] = chr(0x10000 + ((previous - 0xD800) << 10) + (code - 0xDC00))
+                else:
+                    self._string.append(chr(code))
+                self._escape = None
+            return
+        if char == '\\':
+            self._escape = ''
+        elif char == '"':
+            text = ''.join(self._string)
+            self._string = None
+            if self._string_is_key:
+                self._stack[-1][2] = text
+                self._expect = 'colon'
+            else:
+                self._completed(self._attach(text), text, events)
+        else:
+            self._string.append(char)
+
+    def _finish_scalar(self, events):
+        token = ''.join(self._scalar)
+        self._scalar = None
+        try:
+            value = json.loads(token)
+        except ValueError:
+            raise JsonStreamError(f"Invalid JSON token {token!r}")
+        self._completed(self._attach(value), value, events)
+
+    def _attach(self, value):
+        if not self._stack:
+            self.result = value
+            return ()
+        container, path, key = self._stack[-1]
+        if isinstance(container, dict):
+            container[key] = value
+            return path + (key,)
+        container.append(value)
+        return path + (len(container) - 1,)
+
+    def _completed(self, path, value, events):
+        events.append((path, value))
+        if self._stack:
+            self._expect = 'separator'
+        else:
+            self.done = True
+            self._expect = None
@@ -0,0 +1,226 @@
+import argparse
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import cv2
+import numpy as np
+from models import Database
+
+# Usage (from cv_analyzer/):
+#   python video_batch.py recordings/*.mp4 [--workers 8] [--sample-fps 5]
+
+SEGMENT_SECONDS = 30
+# Frames analyzed per second of video; the rest are skipped without being decoded
+DEFAULT_SAMPLE_FPS = 5
+NUM_METRICS = 8
+# Browser recordings often carry no usable frame count or frame rate in the header
+UNRELIABLE_HEADER_EXTENSIONS = ('.webm', '.mkv')
+MAX_PLAUSIBLE_FPS = 240
+
+# Per-process models, built on first use so each worker pays the load once
+_worker_state = {}
+
+def _worker_models():
+    if not _worker_state:
+        import mediapipe as mp
+        from camera_monitor import DetectionScheduler
+        from interview_analyzer import InterviewAnalyzer
+        # Parallelism comes from the process pool; avoid oversubscribing cores inside each worker
+        cv2.setNumThreads(1)
+        _worker_state['face_detection'] = mp.solutions.face_detection.FaceDetection(
+            model_selection=0, min_detection_confidence=0.5)
+        _worker_state['scheduler_cls'] = DetectionScheduler
+        # One Pose graph per worker, reset between segments rather than rebuilt
+        _worker_state['analyzer'] = InterviewAnalyzer()
+    return _worker_state
+
+def _count_frames(cap):
+    # Demux-only pass for containers whose header can't be trusted; also measures the real frame rate
+    frames = 0
+    last_msec = 0.0
+    while cap.grab():
+        frames += 1
+        last_msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+    fps = (frames - 1) / (last_msec / 1000) if frames > 1 and last_msec > 0 else None
+    return frames, fps
+
+def probe(path):
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video {path}")
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        header_ok = frame_count > 0 and 0 < fps <= MAX_PLAUSIBLE_FPS
+        if not header_ok or path.lower().endswith(UNRELIABLE_HEADER_EXTENSIONS):
+            frame_count, measured_fps = _count_frames(cap)
+            logging.info(f"Counted {frame_count} frames in {path} (header said {fps:g} fps)")
+            fps = measured_fps or (fps if 0 < fps <= MAX_PLAUSIBLE_FPS else 30.0)
+    finally:
+        cap.release()
+    if frame_count <= 0:
+        raise ValueError(f"No decodable frames in video {path}")
+    return fps, frame_count
+
+def plan_segments(frame_count, fps, segment_seconds=SEGMENT_SECONDS):
+    frames_per_segment = max(int(segment_seconds * fps), 1)
+    return [(start, min(start + frames_per_segment, frame_count))
+            for start in range(0, frame_count, frames_per_segment)]
+
+def analyze_segment(path, start_frame, end_frame, fps, sample_fps=DEFAULT_SAMPLE_FPS):
+    # Returns ({second: [metric sums (8), metric samples, max face count]}, [(timestamp, face count)])
+    # for one slice of video; the per-frame face counts feed detect_cheating
+    state = _worker_models()
+    # Pose and face tracking carry state between frames, so each segment starts fresh
+    analyzer = state['analyzer']
+    analyzer.reset()
+    scheduler = state['scheduler_cls'](state['face_detection'])
+    step = max(int(round(fps / sample_fps)), 1)
+    buckets = {}
+    face_counts = []
+
+    cap = cv2.VideoCapture(path)
+    try:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        for index in range(start_frame, end_frame):
+            if (index - start_frame) % step:
+                # grab() demuxes without decoding, which is most of the cost of a frame
+                if not cap.grab():
+                    break
+                continue
+            success, frame = cap.read()
+            if not success:
+                break
+            timestamp = index / fps
+            bucket = buckets.setdefault(int(timestamp), [np.zeros(NUM_METRICS), 0, 0])
+            _, face_count = scheduler.process(frame, now=timestamp)
+            bucket[2] = max(bucket[2], face_count)
+            face_counts.append((timestamp, face_count))
+            _, metrics = analyzer.analyze_frame(frame, timestamp=timestamp, draw=False)
+            if metrics is not None:
+                bucket[0] += metrics.to_array()
+                bucket[1] += 1
+    finally:
+        cap.release()
+    return buckets, face_counts
+
+def merge_timeline(segment_buckets):
+    # Segments can share a boundary second, so buckets are summed before averaging
+    merged = {}
+    for buckets in segment_buckets:
+        for second, (sums, samples, faces) in buckets.items():
+            if second in merged:
+                merged[second][0] += sums
+                merged[second][1] += samples
+                merged[second][2] = max(merged[second][2], faces)
+            else:
+                merged[second] = [sums.copy(), samples, faces]
+
+    from interview_analyzer import InterviewMetrics
+    rows = []
+    for second in sorted(merged):
+        sums, samples, faces = merged[second]
+        if samples:
+            metrics = InterviewMetrics.from_array(sums / samples)
+            values = [float(value) for value in metrics.to_array()]
+            posture_score = metrics.get_total_score()
+        else:
+            values = [None] * NUM_METRICS
+            posture_score = None
+        rows.append((second, *values, posture_score, faces))
+    return rows
+
+def detect_cheating(face_counts, cheating_seconds):
+    # Same rule as CameraMonitor, replayed on the video clock: more than one face on every sampled
+    # frame for longer than cheating_seconds, with any frame showing one face or none resetting the run
+    started = None
+    for timestamp, faces in sorted(face_counts):
+        if faces > 1:
+            if started is None:
+                started = timestamp
+            elif timestamp - started > cheating_seconds:
+                return True
+        else:
+            started = None
+    return False
+
+def analyze_video(path, pool, sample_fps=DEFAULT_SAMPLE_FPS, segment_seconds=SEGMENT_SECONDS):
+    fps, frame_count = probe(path)
+    segments = plan_segments(frame_count, fps, segment_seconds)
+    futures = [pool.submit(analyze_segment, path, start, end, fps, sample_fps) for start, end in segments]
+    segment_buckets, face_counts = [], []
+    for future in as_completed(futures):
+        buckets, counts = future.result()
+        segment_buckets.append(buckets)
+        face_counts.extend(counts)
+    return merge_timeline(segment_buckets), face_counts, frame_count / fps
+
+def run_videos(paths, db=None, workers=None, sample_fps=DEFAULT_SAMPLE_FPS, segment_seconds=SEGMENT_SECONDS,
+               session_id=None):
+    from camera_monitor import CHEATING_SECONDS
+    db = db or Database()
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path in paths:
+            started = time.perf_counter()
+            try:
+                rows, face_counts, duration = analyze_video(path, pool, sample_fps, segment_seconds)
+            except ValueError as e:
+                # Nothing is stored, so an unreadable video can't pass as a clean, empty timeline
+                logging.error(f"Skipping {path}: {str(e)}")
+                summaries.append({'path': path, 'error': str(e)})
+                continue
+            elapsed = time.perf_counter() - started
+
+            # Timeline rows hang off the session that recorded the video, or a new one for it
+            target = session_id or db.get_session_by_recording(path) or db.log_interview_session(
+                None, None, 'offline_analysis', recording_path=path)
+            cheating = detect_cheating(face_counts, CHEATING_SECONDS)
+            db.save_interview_timeline(target, rows, cheating=cheating)
+
+            scores = [row[-2] for row in rows if row[-2] is not None]
+            summary = {
+                'path': path,
+                'session_id': target,
+                'seconds': len(rows),
+                'posture_score': sum(scores) / len(scores) if scores else None,
+                'cheating': cheating,
+                'speedup': duration / elapsed if elapsed > 0 else math.inf,
+            }
+            logging.info(f"Analyzed {path}: {duration:.0f}s of video in {elapsed:.1f}s "
+                         f"({summary['speedup']:.1f}x real time), cheating={cheating}")
+            summaries.append(summary)
+    return summaries
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline posture and cheating analysis of recorded interviews")
+    parser.add_argument('videos', nargs='+', help="Video files to analyze")
+    parser.add_argument('--workers', type=int, default=None, help="Analysis processes (default: CPU count)")
+    parser.add_argument('--sample-fps', type=float, default=DEFAULT_SAMPLE_FPS,
+                        help="Frames analyzed per second of video")
+    parser.add_argument('--segment-seconds', type=int, default=SEGMENT_SECONDS)
+    parser.add_argument('--session-id', help="interview_sessions row to attach the timeline to (one video only)")
+    args = parser.parse_args()
+
+    if args.session_id and len(args.videos) > 1:
+        parser.error("--session-id can only be used with a single video")
+
+    logging.basicConfig(level=logging.INFO)
+    missing = [path for path in args.videos if not os.path.exists(path)]
+    if missing:
+        parser.error(f"video not found: {', '.join(missing)}")
+
+    for summary in run_videos(args.videos, workers=args.workers, sample_fps=args.sample_fps,
+                              segment_seconds=args.segment_seconds, session_id=args.session_id):
+        if 'error' in summary:
+            print(f"{summary['path']}: failed, {summary['error']}")
+            continue
+        score = summary['posture_score']
+        print(f"{summary['path']}: session {summary['session_id']}, {summary['seconds']} seconds, "
+              f"posture {score if score is None else round(score, 1)}, cheating {summary['cheating']}, "
+              f"{summary['speedup']:.1f}x real time")
+
+if __name__ == "__main__":
+    main()